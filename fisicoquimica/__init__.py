@@ -0,0 +1,30 @@
+"""Rotinas de apoio aos exemplos do e-book de Físico-Química.
+
+Módulos:
+
+    antoine     registro de coeficientes de Antoine e pressões de vapor
+    raoult      pontos de bolha e de orvalho de soluções ideais
+    diagrama    diagramas T-x-y e P-x-y de misturas binárias ideais
+    henry       constantes de Henry H(T) e gases dissolvidos
+    flash       flash isotérmico com espécies de Raoult e de Henry
+    sistemas    sistemas lineares de equilíbrio de fases resolvidos em lote
+    mergulho    N2 dissolvido ao longo de perfis de mergulho, em blocos
+    carbonato   pH e especiação do sistema CO2/HCO3-/CO3 2- sem fsolve
+    especiacao  especiação ácido-base geral (ácidos, gases e eletrólitos fortes)
+    continuacao varreduras de parâmetros com estimativas iniciais aproveitadas
+    titulacao   curvas de titulação com pH, especiação e capacidade tampão, em blocos
+    gibbs       equilíbrio químico de gases ideais por minimização de Gibbs
+    vant_hoff   K(T) pela equação de van't Hoff com Delta Cp(T) e tabelas de ln K
+    amonia      mapas T x P do equilíbrio da síntese da amônia com correção K_phi
+    extensao    avanço de reação pelas raízes do polinômio da ação das massas
+    termoquimica base de dados termoquímicos em colunas, mapeada em memória
+    cubica      raízes vetorizadas de equações de estado cúbicas (Cardano + Newton)
+    eos         família de equações cúbicas (vdW, RK, SRK, PR) com Z, V, ln phi e residuais
+    saturacao   curva de saturação de equações cúbicas (igualdade de fugacidades em ln p)
+    jacobiano   jacobianos exatos (números duais ou passo complexo) para fsolve e least_squares
+    estados_correspondentes Z, H residual e ln phi generalizados (Lee-Kesler) por tabelas reduzidas
+    fugacidade  ln phi em forma fechada (virial, misturas cúbicas) e de dados PV tabelados
+    virial      ajuste em lote dos coeficientes do virial de muitas isotermas e de B(T)
+    boyle       temperaturas de Boyle e curvas de inversão de Joule-Thomson em lote
+    ingestao    leitura em blocos de arquivos PVT (CSV, .npy mapeado, Parquet) e regressão incremental
+"""
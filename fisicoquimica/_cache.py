@@ -0,0 +1,54 @@
+"""Cache em disco (arquivos .npz) para tabelas calculadas pelos demais módulos."""
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+
+def diretorio_cache(diretorio=None):
+    """Diretório do cache: argumento, variável FISICOQUIMICA_CACHE ou ~/.cache."""
+    if diretorio is None:
+        diretorio = os.environ.get('FISICOQUIMICA_CACHE',
+                                   os.path.join(os.path.expanduser('~'), '.cache', 'fisicoquimica'))
+    return diretorio
+
+
+def chave(*partes):
+    """Resumo SHA-1 das partes (números, textos ou vetores) que definem a tabela."""
+    h = hashlib.sha1()
+    for parte in partes:
+        if isinstance(parte, str):
+            h.update(parte.encode())
+        else:
+            arr = np.ascontiguousarray(parte, dtype=float)
+            h.update(str(arr.shape).encode())
+            h.update(arr.tobytes())
+        h.update(b'|')
+    return h.hexdigest()
+
+
+def carrega_ou_calcula(nome, calcula, diretorio=None):
+    """Lê a tabela nome.npz do cache ou chama calcula() e grava o resultado.
+
+    calcula deve retornar um dicionário de vetores. Com diretorio=False o cache
+    não é usado.
+    """
+    if diretorio is False:
+        return calcula()
+    diretorio = diretorio_cache(diretorio)
+    caminho = os.path.join(diretorio, nome + '.npz')
+    if os.path.exists(caminho):
+        with np.load(caminho) as dados:
+            return {k: dados[k] for k in dados.files}
+
+    tabela = calcula()
+    os.makedirs(diretorio, exist_ok=True)
+    # grava em um arquivo temporário e renomeia para não deixar tabelas
+    # incompletas quando vários processos escrevem ao mesmo tempo
+    fd, tmp = tempfile.mkstemp(suffix='.npz', dir=diretorio)
+    with os.fdopen(fd, 'wb') as arquivo:
+        np.savez(arquivo, **tabela)
+    os.replace(tmp, caminho)
+    return tabela
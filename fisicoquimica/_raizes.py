@@ -0,0 +1,132 @@
+"""Rotinas vetorizadas para o cálculo de raízes usadas pelos demais módulos."""
+
+import numpy as np
+
+
+def newton_intervalo(fun, a, b, x0=None, tol=1e-10, maxiter=100):
+    """Método de Newton protegido por bissecção, aplicado elemento a elemento.
+
+    fun(x) deve retornar a tupla (f, df) com o mesmo formato de x. Os extremos
+    a e b devem conter a raiz, isto é, f(a) e f(b) com sinais opostos. Quando o
+    passo de Newton sai do intervalo (ou a derivada é nula) é feito um passo de
+    bissecção, de forma que a convergência é garantida para todos os pontos.
+    """
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    a = a.copy()
+    b = b.copy()
+    if x0 is None:
+        x = 0.5*(a + b)
+    else:
+        x = np.clip(np.broadcast_to(np.asarray(x0, dtype=float), a.shape), np.minimum(a, b), np.maximum(a, b))
+
+    fa = fun(a)[0]
+    for _ in range(maxiter):
+        f, df = fun(x)
+        # atualização do intervalo mantendo f(a) com o mesmo sinal
+        mesmo_sinal = np.sign(f) == np.sign(fa)
+        a = np.where(mesmo_sinal, x, a)
+        b = np.where(mesmo_sinal, b, x)
+        fa = np.where(mesmo_sinal, f, fa)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_novo = x - f/df
+        fora = ~np.isfinite(x_novo) | ((x_novo - a)*(x_novo - b) > 0)
+        x_novo = np.where(fora, 0.5*(a + b), x_novo)
+
+        convergiu = (np.abs(x_novo - x) <= tol*(1 + np.abs(x))) | (f == 0)
+        x = x_novo
+        if np.all(convergiu):
+            break
+    return x
+
+
+def raizes_cubicas(a2, a1, a0):
+    """Raízes reais de x**3 + a2 x**2 + a1 x + a0 = 0 pelas fórmulas de Cardano.
+
+    Os coeficientes podem ser vetores. Retorna o formato (..., 3) com as raízes
+    em ordem crescente; quando há um par complexo as posições correspondentes
+    recebem nan.
+    """
+    a2, a1, a0 = np.broadcast_arrays(*(np.asarray(c, dtype=float) for c in (a2, a1, a0)))
+    # equação reduzida t**3 + p t + q = 0 com x = t - a2/3
+    desloc = -a2/3
+    p = a1 - a2**2/3
+    q = 2*a2**3/27 - a2*a1/3 + a0
+    disc = (q/2)**2 + (p/3)**3
+
+    raizes = np.full(a2.shape + (3,), np.nan)
+
+    # uma raiz real: escolhe o sinal que evita cancelamento em u
+    uma = disc > 0
+    sq = np.sqrt(np.where(uma, disc, 0.))
+    u = np.cbrt(-q/2 - np.where(q >= 0, sq, -sq))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v = np.where(u != 0, -p/(3*u), 0.)
+    raizes[..., 0] = np.where(uma, u + v + desloc, np.nan)
+
+    # três raízes reais: forma trigonométrica
+    r = np.sqrt(np.where(uma, 0., -p/3))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos3 = np.where(r > 0, -q/2/r**3, 1.)
+    theta = np.arccos(np.clip(cos3, -1., 1.))
+    k = np.arange(3)
+    trig = 2*r[..., None]*np.cos((theta[..., None] - 2*np.pi*k)/3) + desloc[..., None]
+    raizes = np.where(uma[..., None], raizes, trig)
+    return np.sort(raizes, axis=-1)
+
+
+def raizes_polinomio(c):
+    """Raízes de polinômios com coeficientes c (ordem crescente, último eixo).
+
+    Retorna (..., grau) com nan nas raízes complexas.
+    """
+    c = np.asarray(c, dtype=float)
+    grau = c.shape[-1] - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if grau == 1:
+            return (-c[..., 0]/c[..., 1])[..., None]
+        if grau == 2:
+            a, b, c0 = c[..., 2], c[..., 1], c[..., 0]
+            disc = b**2 - 4*a*c0
+            q = -0.5*(b + np.where(b >= 0, 1., -1.)*np.sqrt(np.where(disc >= 0, disc, np.nan)))
+            return np.stack([q/a, c0/q], axis=-1)
+        if grau == 3:
+            return raizes_cubicas(c[..., 2]/c[..., 3], c[..., 1]/c[..., 3], c[..., 0]/c[..., 3])
+        if grau == 4:
+            return _raizes_quarticas(*(c[..., j]/c[..., 4] for j in (3, 2, 1, 0)))
+        # matriz companheira do polinômio mônico
+        monico = c[..., :-1]/c[..., -1:]
+        C = np.zeros(c.shape[:-1] + (grau, grau))
+        C[..., np.arange(1, grau), np.arange(grau - 1)] = 1.
+        C[..., :, -1] = -monico
+        finitos = np.all(np.isfinite(C), axis=(-2, -1))
+        raizes = np.full(c.shape[:-1] + (grau,), np.nan, dtype=complex)
+        raizes[finitos] = np.linalg.eigvals(C[finitos])
+        reais = np.abs(raizes.imag) <= 1e-9*np.maximum(np.abs(raizes.real), 1.)
+        return np.where(reais, raizes.real, np.nan)
+
+
+def _raizes_quarticas(a, b, c, d):
+    # método de Ferrari: x = y - a/4 e y**4 + p y**2 + q y + r = 0
+    p = b - 3*a**2/8
+    q = c - a*b/2 + a**3/8
+    r = d - a*c/4 + a**2*b/16 - 3*a**4/256
+    # a maior raiz da cúbica resolvente é não negativa; Newton corrige a
+    # perda de precisão de Cardano quando ela é muito pequena
+    c2, c1, c0 = 2*p, p**2 - 4*r, -q**2
+    z = np.maximum(np.nanmax(raizes_cubicas(c2, c1, c0), axis=-1), 0.)
+    for _ in range(2):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            passo = (((z + c2)*z + c1)*z + c0)/((3*z + 2*c2)*z + c1)
+        z = np.maximum(np.where(np.isfinite(passo), z - passo, z), 0.)
+    s = np.sqrt(z)
+    # fatoração (y**2 + s y + m - t)(y**2 - s y + m + t), com m = (p + z)/2 e
+    # t**2 = m**2 - r, o que evita dividir q por s pequeno
+    m = (p + z)/2
+    t = np.where(q < 0, -1., 1.)*np.sqrt(np.maximum(m**2 - r, 0.))
+    raizes = []
+    for sinal in (1., -1.):
+        disc = z - 4*(m - sinal*t)
+        raiz = np.sqrt(np.where(disc >= 0, disc, np.nan))
+        raizes += [(-sinal*s + raiz)/2, (-sinal*s - raiz)/2]
+    return np.stack(raizes, axis=-1) - a[..., None]/4
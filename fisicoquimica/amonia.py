@@ -0,0 +1,89 @@
+"""Mapas de equilíbrio da síntese da amônia com correção de fugacidade.
+
+Para 0,5 N2 + 1,5 H2 -> NH3 a constante de equilíbrio em termos de
+fugacidades é K = K_phi K_x P**(-1) (P em atm), com a correlação de Gillespie
+e Beattie usada no Exemplo 5 do capítulo de equilíbrio químico:
+
+    log10(1/K_phi) = (0.1191849/T + 91.87212/T**2 + 25122730/T**4) P
+
+Com a alimentação (N2, H2, NH3, inertes) = (a, b, c, i) e avanço e, as
+quantidades são a - e/2, b - 3e/2, c + e e i, e o total é a + b + c + i - e.
+A equação
+
+    ln n_NH3 + ln n_t - ln n_N2/2 - 3 ln n_H2/2 - ln(K P/K_phi) = 0
+
+é crescente em e entre -c e min(2a, 2b/3) e é resolvida pelo método de
+Newton protegido por bissecção para todos os pontos da malha T x P juntos.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from ._raizes import newton_intervalo
+from .vant_hoff import Reacao
+
+REACAO_NH3 = Reacao.de_formacao({'NH3': 1., 'N2': -0.5, 'H2': -1.5})
+
+EquilibrioAmonia = namedtuple('EquilibrioAmonia', 'T P y_NH3 y extensao')
+
+
+def K_phi(T, P):
+    """Fator de correção das fugacidades de Gillespie e Beattie (T em K, P em atm)."""
+    T = np.asarray(T, dtype=float)
+    P = np.asarray(P, dtype=float)
+    return 10**(-(0.1191849/T + 91.87212/T**2 + 25122730/T**4)*P)
+
+
+def fracao_amonia(T, P, K=None, alimentacao=(0.5, 1.5, 0., 0.), fugacidade=True,
+                  tol=1e-12, maxiter=100):
+    """Composição de equilíbrio para T (K) e P (atm), combinados por broadcasting.
+
+    K é a constante de equilíbrio (escalar, vetor ou função de T); por padrão
+    é calculada por REACAO_NH3. alimentacao dá as quantidades de N2, H2, NH3 e
+    inertes. Com fugacidade=False o gás é tratado como ideal (K_phi = 1).
+    Retorna EquilibrioAmonia(T, P, y_NH3, y, extensao), com y no formato
+    (..., 4) na ordem da alimentação.
+    """
+    T, P = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(P, dtype=float))
+    if K is None:
+        K = REACAO_NH3.K(T)
+    elif callable(K):
+        K = K(T)
+    ln_Kx = np.log(np.asarray(K, dtype=float)*P)
+    if fugacidade:
+        ln_Kx = ln_Kx - np.log(K_phi(T, P))
+
+    a, b, c, i = (np.asarray(v, dtype=float) for v in alimentacao)
+    if np.any(a <= 0) or np.any(b <= 0):
+        raise ValueError('a alimentação deve conter N2 e H2')
+    n_t0 = a + b + c + i
+
+    def residuo(e):
+        n_N2, n_H2, n_NH3, n_t = a - e/2, b - 1.5*e, c + e, n_t0 - e
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f = np.log(n_NH3) + np.log(n_t) - 0.5*np.log(n_N2) - 1.5*np.log(n_H2) - ln_Kx
+            df = 1/n_NH3 - 1/n_t + 0.25/n_N2 + 2.25/n_H2
+        return f, df
+
+    # extremos do avanço, ligeiramente afastados para manter os logaritmos finitos
+    e_min = -c
+    e_max = np.minimum(2*a, b/1.5)
+    folga = 1e-14*(e_max - e_min)
+    forma = ln_Kx.shape
+    e = newton_intervalo(residuo, np.broadcast_to(e_min + folga, forma),
+                         np.broadcast_to(e_max - folga, forma), tol=tol, maxiter=maxiter)
+
+    n = np.stack(np.broadcast_arrays(a - e/2, b - 1.5*e, c + e, i + 0*e), axis=-1)
+    y = n/n.sum(axis=-1, keepdims=True)
+    return EquilibrioAmonia(T, P, y[..., 2], y, e)
+
+
+def mapa_amonia(T, P, **opcoes):
+    """Fração molar de NH3 na malha (T, P) de formato (len(T), len(P)).
+
+    As opções são as de fracao_amonia.
+    """
+    T = np.asarray(T, dtype=float)
+    P = np.asarray(P, dtype=float)
+    return fracao_amonia(T[:, None], P[None, :], **opcoes)
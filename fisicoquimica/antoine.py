@@ -0,0 +1,134 @@
+"""Registro de coeficientes de Antoine e cálculo vetorizado da pressão de vapor.
+
+Os coeficientes ficam em uma única tabela (um vetor por coeficiente), de forma
+que a pressão de vapor de milhares de espécies em milhares de temperaturas é
+obtida em uma só operação. A forma estendida da equação de Antoine é
+
+    log(p(torr)) = A - B/(T + C) + D*T_K + E*log(T_K) + F*T_K**2
+
+com T em ºC e T_K = T + 273.15. Com D = E = F = 0 ela se reduz à forma usada
+nos exemplos do livro.
+"""
+
+import numpy as np
+
+COLUNAS = ('A', 'B', 'C', 'D', 'E', 'F', 'Tmin', 'Tmax')
+
+
+class RegistroAntoine:
+    """Tabela de coeficientes de Antoine indexada pelo nome da espécie."""
+
+    def __init__(self):
+        self._dados = np.empty((len(COLUNAS), 8))
+        self._n = 0
+        self._indice = {}
+
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, nome):
+        return nome in self._indice
+
+    @property
+    def nomes(self):
+        return list(self._indice)
+
+    @property
+    def tabela(self):
+        """Vista (8, n_especies) da tabela, uma linha por coeficiente de COLUNAS."""
+        return self._dados[:, :self._n]
+
+    def adicionar(self, nome, A, B, C, D=0., E=0., F=0., Tmin=-np.inf, Tmax=np.inf):
+        """Inclui (ou substitui) os coeficientes de uma espécie. Tmin e Tmax em ºC."""
+        linha = (A, B, C, D, E, F, Tmin, Tmax)
+        if nome in self._indice:
+            self._dados[:, self._indice[nome]] = linha
+            return
+        if self._n == self._dados.shape[1]:
+            self._dados = np.concatenate([self._dados, np.empty_like(self._dados)], axis=1)
+        self._dados[:, self._n] = linha
+        self._indice[nome] = self._n
+        self._n += 1
+
+    def indices(self, nomes=None):
+        """Posições das espécies na tabela (todas, se nomes for None)."""
+        if nomes is None:
+            return np.arange(self._n)
+        if isinstance(nomes, str):
+            nomes = [nomes]
+        try:
+            return np.array([self._indice[nome] for nome in nomes], dtype=int)
+        except KeyError as erro:
+            raise KeyError('espécie sem coeficientes de Antoine: %s' % erro.args[0]) from None
+
+    def coeficientes(self, nomes=None):
+        """Tupla (A, B, C) para as espécies, no formato usado em raoult."""
+        A, B, C = self.tabela[:3, self.indices(nomes)]
+        return A, B, C
+
+    def log10_pressao_vapor(self, T, nomes=None):
+        """log10 da pressão de vapor (torr) em T (ºC), formato T.shape + (n,)."""
+        A, B, C, D, E, F = self.tabela[:6, self.indices(nomes)]
+        T = np.asarray(T, dtype=float)[..., None]
+        log_p = A - B/(T + C)
+        if np.any(D) or np.any(E) or np.any(F):
+            T_K = T + 273.15
+            log_p = log_p + D*T_K + E*np.log10(T_K) + F*T_K**2
+        return log_p
+
+    def pressao_vapor(self, T, nomes=None):
+        """Pressão de vapor (torr) em T (ºC), formato T.shape + (n,)."""
+        return 10**self.log10_pressao_vapor(T, nomes)
+
+    def faixa(self, nomes=None):
+        """Intervalo de validade (Tmin, Tmax) em ºC de cada espécie."""
+        Tmin, Tmax = self.tabela[6:, self.indices(nomes)]
+        return Tmin, Tmax
+
+    def chebyshev(self, nomes, Tmin, Tmax, grau=12):
+        """Aproximação de Chebyshev de log10(p) para uso em laços internos."""
+        return AproximacaoChebyshev(self, nomes, Tmin, Tmax, grau)
+
+
+class AproximacaoChebyshev:
+    """Polinômios de Chebyshev ajustados a log10(p(T)) no intervalo [Tmin, Tmax].
+
+    Os polinômios são ajustados nos nós de Chebyshev, o que dá erro próximo do
+    mínimo possível para o grau escolhido. Fora do intervalo o resultado não é
+    confiável.
+    """
+
+    def __init__(self, registro, nomes, Tmin, Tmax, grau=12):
+        self.Tmin = float(Tmin)
+        self.Tmax = float(Tmax)
+        k = np.arange(grau + 1)
+        t = np.cos(np.pi*(k + 0.5)/(grau + 1))
+        T = self._temperatura(t)
+        self.coef = np.polynomial.chebyshev.chebfit(t, registro.log10_pressao_vapor(T, nomes), grau)
+
+    def _temperatura(self, t):
+        return 0.5*(self.Tmax + self.Tmin) + 0.5*(self.Tmax - self.Tmin)*t
+
+    def _variavel(self, T):
+        return (2*np.asarray(T, dtype=float) - self.Tmax - self.Tmin)/(self.Tmax - self.Tmin)
+
+    def log10_pressao_vapor(self, T):
+        t = self._variavel(T)[..., None]
+        return np.polynomial.chebyshev.chebval(t, self.coef, tensor=False)
+
+    def __call__(self, T):
+        """Pressão de vapor (torr) em T (ºC), formato T.shape + (n,)."""
+        return 10**self.log10_pressao_vapor(T)
+
+
+REGISTRO = RegistroAntoine()
+
+# log(p(torr)) = A - B/(T(ºC) + C)
+REGISTRO.adicionar('benzeno', 6.90565, 1211.033, 220.79, Tmin=8., Tmax=103.)
+REGISTRO.adicionar('tolueno', 6.95334, 1343.943, 219.377, Tmin=6., Tmax=137.)
+REGISTRO.adicionar('agua', 8.07131, 1730.63, 233.426, Tmin=1., Tmax=100.)
+REGISTRO.adicionar('metanol', 8.08097, 1582.271, 239.726, Tmin=15., Tmax=84.)
+REGISTRO.adicionar('etanol', 8.20417, 1642.89, 230.3, Tmin=-57., Tmax=80.)
+REGISTRO.adicionar('acetona', 7.02447, 1161.0, 224.0, Tmin=-13., Tmax=55.)
+REGISTRO.adicionar('n-hexano', 6.87601, 1171.17, 224.41, Tmin=-25., Tmax=92.)
+REGISTRO.adicionar('n-heptano', 6.89677, 1264.90, 216.54, Tmin=-2., Tmax=124.)
@@ -0,0 +1,162 @@
+"""Temperaturas de Boyle e curvas de inversão de Joule-Thomson em lote.
+
+Na temperatura de Boyle o segundo coeficiente do virial se anula, B(T_B) = 0;
+na temperatura de inversão de Joule-Thomson a p -> 0, d(B/T)/dT = 0, isto é,
+T dB/dT = B. Para os modelos de B(T) dos exemplos as duas têm forma fechada:
+
+    B = a + b exp(-c/T**2)     T_B = sqrt(-c/ln(-a/b))
+    B = c2 T**2 + c1 T + c0    raiz com dB/dT > 0;  inversão: T = sqrt(c0/c2)
+
+Para as equações cúbicas (módulo eos) B(T) = b - a(T)/(RT), e T_B também é
+explícita: a/(Rb) para van der Waals, (a sqrt(Tc)/(Rb))**(2/3) para
+Redlich-Kwong e, com s = sqrt(T/Tc), s = sqrt(a)(1 + m)/(sqrt(bRTc) + m sqrt(a))
+para Soave e Peng-Robinson. A curva de inversão completa, em que
+T (dp/dT)_V + V (dp/dV)_T = 0, é calculada ao longo de uma malha de volumes:
+em cada volume a condição é linear em T (van der Waals), cúbica em sqrt(T)
+com solução direta (Redlich-Kwong) ou de segundo grau em s (Soave e
+Peng-Robinson).
+
+Todas as funções recebem vetores de parâmetros (uma entrada por gás) e não
+usam np.roots nem laços sobre os gases.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from . import eos
+from ._raizes import newton_intervalo
+
+R = 0.082057    #[L atm/(K mol)]
+
+FAMILIAS = {
+    'vdw': eos.VanDerWaals,
+    'rk': eos.RedlichKwong,
+    'srk': eos.SoaveRedlichKwong,
+    'pr': eos.PengRobinson,
+}
+
+InversaoJT = namedtuple('InversaoJT', 'T p V')
+
+
+def boyle_exponencial(a, b, c):
+    """T_B de B(T) = a + b exp(-c/T**2); nan quando B não se anula."""
+    a, b, c = (np.asarray(v, dtype=float) for v in (a, b, c))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.sqrt(-c/np.log(-a/b))
+
+
+def inversao_exponencial(a, b, c, tol=1e-12):
+    """Temperatura de inversão a p -> 0 para B(T) = a + b exp(-c/T**2).
+
+    Com x = c/T**2 a condição T dB/dT = B fica b exp(-x)(2x - 1) = a, cuja raiz
+    procurada está em 0 < x < 3/2 (máximo do lado esquerdo).
+    """
+    a, b, c = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, c)))
+
+    def fun(x):
+        e = b*np.exp(-x)
+        return e*(2*x - 1) - a, e*(3 - 2*x)
+
+    valida = (fun(np.zeros_like(a))[0] < 0) & (fun(np.full_like(a, 1.5))[0] > 0)
+    x = newton_intervalo(fun, np.zeros_like(a), np.full_like(a, 1.5), tol=tol)
+    return np.where(valida, np.sqrt(c/x), np.nan)
+
+
+def boyle_quadratica(coef):
+    """T_B de B(T) = c2 T**2 + c1 T + c0, coef (..., 3) na ordem de np.polyfit.
+
+    Das duas raízes é escolhida aquela em que B cresce com T (dB/dT > 0).
+    """
+    coef = np.asarray(coef, dtype=float)
+    c2, c1, c0 = coef[..., 0], coef[..., 1], coef[..., 2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # dB/dT = 2 c2 T + c1 = +sqrt(disc) na raiz (-c1 + sqrt(disc))/(2 c2),
+        # escrita na forma sem cancelamento quando c1 > 0
+        raiz = np.sqrt(c1**2 - 4*c2*c0)
+        T = np.where(c1 > 0, 2*c0/(-c1 - raiz), (-c1 + raiz)/(2*c2))
+    return np.where(np.isfinite(T), T, np.nan)
+
+
+def inversao_quadratica(coef):
+    """Temperatura de inversão a p -> 0 para B(T) quadrático: T = sqrt(c0/c2)."""
+    coef = np.asarray(coef, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.sqrt(coef[..., 2]/coef[..., 0])
+
+
+def constantes_cubica(familia, Tc, Pc, omega=0., R=R):
+    """(a_c, b, m) de cada gás pela família 'vdw', 'rk', 'srk' ou 'pr'."""
+    try:
+        classe = FAMILIAS[familia]
+    except KeyError:
+        raise ValueError("familia deve ser 'vdw', 'rk', 'srk' ou 'pr'") from None
+    Tc, Pc, omega = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (Tc, Pc, omega)))
+    a = classe.Omega_a*R**2*Tc**2/Pc
+    b = classe.Omega_b*R*Tc/Pc
+    if issubclass(classe, eos._AlphaSoave):
+        c0, c1, c2 = classe.coef_m
+        m = c0 + c1*omega + c2*omega**2
+    else:
+        m = np.zeros_like(Tc)
+    return a, b, m
+
+
+def boyle_cubica(familia, Tc, Pc, omega=0., R=R):
+    """Temperatura de Boyle de cada gás, B(T) = b - a(T)/(RT) = 0."""
+    a, b, m = constantes_cubica(familia, Tc, Pc, omega, R)
+    Tc = np.broadcast_to(np.asarray(Tc, dtype=float), a.shape)
+    if familia == 'vdw':
+        return a/(R*b)
+    if familia == 'rk':
+        # a(T) = a (Tc/T)**0.5
+        return (a*np.sqrt(Tc)/(R*b))**(2/3)
+    s = np.sqrt(a)*(1 + m)/(np.sqrt(b*R*Tc) + m*np.sqrt(a))
+    return Tc*s**2
+
+
+def inversao_cubica(familia, Tc, Pc, omega=0., v=None, R=R):
+    """Curva de inversão de Joule-Thomson de cada gás.
+
+    v é a malha de volumes reduzidos V/b (padrão: 400 valores entre 1,02 e
+    1000). Retorna InversaoJT com T, p e V no formato (gases, len(v)); pontos
+    com p <= 0 recebem nan.
+    """
+    a, b, m = constantes_cubica(familia, Tc, Pc, omega, R)
+    Tc = np.broadcast_to(np.asarray(Tc, dtype=float), a.shape)
+    u, w = FAMILIAS[familia].u, FAMILIAS[familia].w
+    v = np.geomspace(1.02, 1e3, 400) if v is None else np.asarray(v, dtype=float)
+
+    a, b, m, Tc = (x[..., None] for x in (a, b, m, Tc))
+    V = v*b
+    D = V**2 + u*b*V + w*b**2
+    G = V*(2*V + u*b)/D**2
+    K = R*b/(V - b)**2
+    # -K T - T a'(T)/D + a(T) G = 0
+    if familia == 'vdw':
+        T = a*G/K
+        aT = a
+    elif familia == 'rk':
+        s = np.cbrt(a*(0.5/D + G)/(K*Tc))
+        T = Tc*s**2
+        aT = a/s
+    else:
+        c = 1 + m
+        H = m/D
+        k2 = a*(m**2*G - m*H) - K*Tc
+        k1 = a*c*(H - 2*m*G)
+        k0 = a*c**2*G
+        with np.errstate(invalid='ignore', divide='ignore'):
+            disc = k1**2 - 4*k2*k0
+            q = -0.5*(k1 + np.where(k1 >= 0, 1., -1.)*np.sqrt(disc))
+            raizes = np.stack([q/k2, k0/q])
+        f = 1 + m*(1 - raizes)
+        raizes = np.where((raizes > 0) & (f > 0), raizes, np.nan)
+        s = np.nanmax(raizes, axis=0, initial=-np.inf)
+        s = np.where(np.isfinite(s), s, np.nan)
+        T = Tc*s**2
+        aT = a*(1 + m*(1 - s))**2
+    p = R*T/(V - b) - aT/D
+    positiva = p > 0
+    return InversaoJT(np.where(positiva, T, np.nan), np.where(positiva, p, np.nan),
+                      np.where(positiva, V, np.nan))
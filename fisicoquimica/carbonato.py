@@ -0,0 +1,78 @@
+"""pH de soluções aquosas em equilíbrio com CO2 atmosférico.
+
+Substituindo os equilíbrios
+
+    [CO2] = Kh pCO2
+    [HCO3-] = Ka1 [CO2]/[H+]
+    [CO3 2-] = Ka2 [HCO3-]/[H+]
+    [OH-] = Kw/[H+]
+
+no balanço de carga [H+] + d = [HCO3-] + 2[CO3 2-] + [OH-], em que d é o
+excesso de cátions de eletrólitos fortes (base forte positiva, ácido forte
+negativo, em mol/L), obtém-se um polinômio de terceiro grau em [H+]:
+
+    H**3 + d H**2 - (Ka1 Kh pCO2 + Kw) H - 2 Ka1 Ka2 Kh pCO2 = 0
+
+que tem exatamente uma raiz positiva (regra de sinais de Descartes). A raiz é
+calculada pelas fórmulas de Cardano para vetores de pCO2, Kh, Ka1, Ka2 e d, sem
+estimativas iniciais (por deflação da raiz negativa quando a base forte
+domina), e refinada por dois passos de Newton.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from ._raizes import raizes_cubicas
+
+Kh_CO2 = 3.4e-2     #[mol/(L atm)]
+Ka1_CO2 = 4.5e-7
+Ka2_CO2 = 7.0e-11
+Kw = 1.0e-14
+
+Carbonato = namedtuple('Carbonato', 'H pH CO2 HCO3 CO3 OH')
+
+
+def especiacao_carbonato(pCO2, Kh=Kh_CO2, Ka1=Ka1_CO2, Ka2=Ka2_CO2, forte=0., Kw=Kw,
+                         segunda_dissociacao=True):
+    """Especiação do sistema CO2/HCO3-/CO3 2- em água (concentrações em mol/L).
+
+    pCO2 em atm. Todos os argumentos podem ser vetores, combinados pelas regras
+    de broadcasting do numpy. Com segunda_dissociacao=False o carbonato é
+    desprezado e o polinômio se reduz a uma equação do segundo grau, como no
+    item (a) do exemplo do livro.
+    """
+    pCO2, Kh, Ka1, Ka2, d, Kw = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (pCO2, Kh, Ka1, Ka2, forte, Kw)))
+    CO2 = Kh*pCO2
+    c1 = Ka1*CO2 + Kw
+    c0 = 2*Ka1*Ka2*CO2 if segunda_dissociacao else np.zeros_like(c1)
+
+    if segunda_dissociacao:
+        # mudança de escala H = s u para que os coeficientes fiquem próximos de 1
+        s = np.maximum.reduce([np.abs(d), np.sqrt(c1), np.cbrt(c0)])
+        a2, a1, a0 = d/s, -c1/s**2, -c0/s**3
+        u = raizes_cubicas(a2, a1, a0)
+        # a raiz de maior módulo é precisa; quando é negativa (base forte
+        # dominante), a raiz positiva, pequena, sairia de Cardano com
+        # cancelamento e é obtida por Vieta das outras duas:
+        # u2 u3 = -a0/u1 e u2 + u3 = (a1 + a0/u1)/u1
+        u1 = np.take_along_axis(u, np.nanargmax(np.abs(u), axis=-1)[..., None], axis=-1)[..., 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            produto = -a0/u1
+            soma = (a1 - produto)/u1
+            r = np.sqrt(soma**2 - 4*produto)
+            positiva = np.where(soma > 0, 0.5*(soma + r), -2*produto/(r - soma))
+        H = np.where(u1 > 0, u1, positiva)*s
+        for _ in range(2):
+            f = ((H + d)*H - c1)*H - c0
+            df = (3*H + 2*d)*H - c1
+            H = H - f/df
+    else:
+        # raiz positiva de H**2 + d H - c1 = 0 na forma sem cancelamento
+        r = np.sqrt(d**2 + 4*c1)
+        H = np.where(d > 0, 2*c1/(d + r), 0.5*(r - d))
+
+    HCO3 = Ka1*CO2/H
+    CO3 = Ka2*HCO3/H if segunda_dissociacao else np.zeros_like(H)
+    return Carbonato(H, -np.log10(H), CO2, HCO3, CO3, Kw/H)
@@ -0,0 +1,225 @@
+"""Varreduras de parâmetros com estimativas iniciais aproveitadas (continuação).
+
+Ao varrer um parâmetro (pressão parcial de um gás, temperatura etc.) em uma
+sequência ordenada, a solução de um ponto é uma ótima estimativa inicial para
+o ponto seguinte. varredura resolve o sistema residuo(x, lam) = 0 para cada
+valor de lam usando o método de Newton a partir de uma previsão:
+
+    preditor=None        solução do ponto anterior
+    preditor='secante'   extrapolação linear das duas últimas soluções
+    preditor='tangente'  x - J^-1 dF/dlam (lam_novo - lam), passo de Euler
+
+Com espaco_log=True as incógnitas são resolvidas em ln(x), o que mantém
+concentrações positivas; cada passo muda ln(x) de no máximo passo_log, de
+forma que estimativas como 1e-20 muito longe da raiz são corrigidas em
+poucas iterações sem estouro de exp. O jacobiano por diferenças finitas usa
+passos relativos a x, e a convergência é testada pelo passo de Newton
+relativo a x, e não pelo valor absoluto do resíduo, que é minúsculo em
+concentrações pequenas mesmo longe da raiz.
+
+Sem jacobiano analítico, o jacobiano do ponto anterior é reaproveitado com
+atualizações de Broyden, e o jacobiano por diferenças só é recalculado quando
+o passo aproximado falha e para confirmar a convergência. Na varredura de
+pHNO3 do exemplo de Dissolucao_acidos (200 pontos de 1e-10 a 1e-6 atm, com a
+estimativa (1e-2, 1e-6, 1e-3, 1e-20, 1e-3) do livro) o preditor secante
+usa cerca de 9 avaliações do resíduo por ponto em ln x, contra 117 de
+soluções independentes a partir da estimativa fixa (11 contra 109 em x).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+Varredura = namedtuple('Varredura', 'x iteracoes avaliacoes convergiu')
+
+
+def _jacobiano_numerico(f, x, fx, h=1e-7):
+    # passo relativo a cada incógnita, para que valores como 1e-20 não se
+    # percam diante de um passo absoluto; quando o resíduo nem chega a mudar
+    # (x_j muito menor que os outros termos da equação), o passo cresce até
+    # o limite h max(|x_j|, 1)
+    J = np.empty((len(fx), len(x)))
+    for j in range(len(x)):
+        dx = h*abs(x[j]) if x[j] != 0 else h
+        dx_max = h*max(abs(x[j]), 1.)
+        while True:
+            xj = x.copy()
+            xj[j] += dx
+            df = f(xj) - fx
+            if np.any((df != 0) & (np.abs(df) >= h*np.abs(fx))) or dx >= dx_max:
+                break
+            dx = min(1e3*dx, dx_max)
+        J[:, j] = df/dx
+    return J
+
+
+class _Problema:
+    """Resíduo e jacobiano na variável de iteração (x ou ln x), com contagem."""
+
+    def __init__(self, residuo, jacobiano, espaco_log):
+        self.residuo = residuo
+        self.jacobiano = jacobiano
+        self.espaco_log = espaco_log
+        self.avaliacoes = 0
+
+    def x(self, z):
+        return np.exp(z) if self.espaco_log else z
+
+    def z(self, x):
+        return np.log(x) if self.espaco_log else np.asarray(x, dtype=float)
+
+    def F(self, z, lam):
+        return self._F(self.x(z), lam)
+
+    def _F(self, x, lam):
+        self.avaliacoes += 1
+        return np.asarray(self.residuo(x, lam), dtype=float)
+
+    def J(self, z, lam, Fz):
+        # dF/dx (analítico ou por diferenças no próprio x) e a regra da cadeia
+        # dF/dz = dF/dx x no espaço logarítmico
+        x = self.x(z)
+        if self.jacobiano is None:
+            J = _jacobiano_numerico(lambda w: self._F(w, lam), x, Fz)
+        else:
+            J = np.atleast_2d(np.asarray(self.jacobiano(x, lam), dtype=float))
+        return J*x if self.espaco_log else J
+
+
+def _newton(prob, z, lam, tol, maxiter, passo_log, J=None):
+    # convergência pelo tamanho do passo de Newton, relativo a x (em ln x o
+    # passo já é relativo): um critério absoluto em |F| aceitaria
+    # concentrações pequenas muito longe da raiz.
+    # Sem jacobiano analítico, J (de um ponto anterior da varredura) é
+    # reaproveitado e corrigido pela atualização de Broyden a cada passo; o
+    # jacobiano por diferenças só é recalculado quando o passo aproximado
+    # falha. Retorna também o jacobiano final, para o ponto seguinte.
+    if prob.jacobiano is not None:
+        J = None
+    F = prob.F(z, lam)
+    if not np.all(np.isfinite(F)):
+        return z, 0, False, J
+    norma = np.linalg.norm(F)
+    for it in range(maxiter):
+        if norma == 0:
+            return z, it, True, J
+        exato = J is None
+        if exato:
+            J = prob.J(z, lam, F)
+        try:
+            dz = np.linalg.solve(J, -F)
+        except np.linalg.LinAlgError:
+            dz = np.full_like(z, np.nan)
+        if not np.all(np.isfinite(dz)):
+            if exato:
+                return z, it, False, None
+            J = None
+            continue
+        if prob.espaco_log:
+            # no máximo passo_log unidades de ln por incógnita e por iteração,
+            # o que evita estouro de exp(z) a partir de estimativas distantes
+            limitado = np.any(np.abs(dz) > passo_log)
+            dz = np.clip(dz, -passo_log, passo_log)
+            escala = 1.
+        else:
+            limitado = False
+            escala = np.abs(z)
+        if np.all(np.abs(dz) <= tol*escala):
+            if exato:
+                return z + dz, it + 1, True, J
+            # o passo aproximado pode ser pequeno longe da raiz: confirma
+            # com o jacobiano exato
+            J = None
+            continue
+        # busca linear simples: reduz o passo até o resíduo diminuir, sem
+        # passar de passo = 1e-4 (resíduo não finito nesse ponto encerra Newton).
+        # Um passo limitado em ln x já é controlado e só precisa de resíduo
+        # finito: longe da raiz |F| pode crescer antes de diminuir
+        passo = 1.
+        while True:
+            z_novo = z + passo*dz
+            F_novo = prob.F(z_novo, lam)
+            norma_nova = np.linalg.norm(F_novo)
+            if (norma_nova < norma or (limitado and np.isfinite(norma_nova))
+                    or passo < 1e-4 or not exato):
+                break
+            passo *= 0.5
+        if not exato and not norma_nova < norma:
+            # passo de Broyden ruim: recomeça do mesmo ponto com o jacobiano exato
+            J = None
+            continue
+        if not np.isfinite(norma_nova):
+            return z, it + 1, False, None
+        if not exato and not limitado:
+            s = z_novo - z
+            J = J + np.outer(F_novo - F - J @ s, s)/(s @ s)
+        else:
+            J = None
+        z, F, norma = z_novo, F_novo, norma_nova
+    return z, maxiter, False, None
+
+
+def varredura(residuo, parametros, x0, jacobiano=None, preditor='secante', espaco_log=False,
+              derivada_parametro=None, tol=1e-10, maxiter=50, passo_log=5.):
+    """Resolve residuo(x, lam) = 0 para cada lam da sequência parametros.
+
+    x0 é a estimativa inicial do primeiro ponto. jacobiano(x, lam), se
+    fornecido, retorna dF/dx; caso contrário é usado um jacobiano por
+    diferenças finitas. derivada_parametro(x, lam) retorna dF/dlam para o
+    preditor tangente (por padrão, diferenças finitas). Cada ponto converge
+    quando o passo de Newton é menor que tol relativo a x (em ln x, menor que
+    tol); com espaco_log=True cada passo muda ln x de no máximo passo_log.
+
+    Retorna Varredura(x, iteracoes, avaliacoes, convergiu) com as soluções
+    (formato (k, n)), o número de iterações de Newton e de avaliações do
+    resíduo em cada ponto e se cada ponto convergiu.
+    """
+    if preditor not in (None, 'secante', 'tangente'):
+        raise ValueError("preditor deve ser None, 'secante' ou 'tangente'")
+    parametros = np.asarray(parametros, dtype=float)
+    k = len(parametros)
+    prob = _Problema(residuo, jacobiano, espaco_log)
+
+    z = prob.z(np.atleast_1d(np.asarray(x0, dtype=float)))
+    solucoes = np.empty((k, len(z)))
+    iteracoes = np.zeros(k, dtype=int)
+    avaliacoes = np.zeros(k, dtype=int)
+    convergiu = np.zeros(k, dtype=bool)
+
+    anterior = None     # (lam, z) do último ponto convergido antes do atual
+    atual = None
+    J = None            # jacobiano aproximado do último ponto convergido
+    for i, lam in enumerate(parametros):
+        inicio = prob.avaliacoes
+        if atual is not None:
+            lam_a, z_a = atual
+            if preditor == 'secante' and anterior is not None and anterior[0] != lam_a:
+                lam_b, z_b = anterior
+                z = z_a + (z_a - z_b)*(lam - lam_a)/(lam_a - lam_b)
+            elif preditor == 'tangente':
+                z = z_a + _tangente(prob, z_a, lam_a, derivada_parametro)*(lam - lam_a)
+            else:
+                z = z_a
+
+        z, iteracoes[i], convergiu[i], J_novo = _newton(prob, z, lam, tol, maxiter, passo_log, J)
+        avaliacoes[i] = prob.avaliacoes - inicio
+        solucoes[i] = prob.x(z)
+        if convergiu[i]:
+            anterior, atual = atual, (lam, z)
+            J = J_novo
+        elif atual is not None:
+            z = atual[1]
+    return Varredura(solucoes, iteracoes, avaliacoes, convergiu)
+
+
+def _tangente(prob, z, lam, derivada_parametro):
+    F = prob.F(z, lam)
+    if derivada_parametro is None:
+        dlam = 1e-7*max(abs(lam), 1.)
+        dF = (prob.F(z, lam + dlam) - F)/dlam
+    else:
+        dF = np.asarray(derivada_parametro(prob.x(z), lam), dtype=float)
+    try:
+        return np.linalg.solve(prob.J(z, lam, F), -dF)
+    except np.linalg.LinAlgError:
+        return np.zeros_like(z)
@@ -0,0 +1,121 @@
+"""Raízes de equações de estado cúbicas para vetores de estados.
+
+As equações cúbicas usuais (van der Waals, Redlich-Kwong, Soave, Peng-Robinson)
+podem ser escritas como
+
+    p = RT/(V - b) - a/(V**2 + u b V + w b**2)
+
+e, com A = a p/(RT)**2 e B = b p/(RT), como um polinômio no fator de
+compressibilidade Z = pV/(RT):
+
+    Z**3 - (1 + B - u B) Z**2 + (A + w B**2 - u B - u B**2) Z - (A B + w B**2 + w B**3) = 0
+
+(u = w = 0 para van der Waals, u = 1 e w = 0 para Redlich-Kwong e Soave,
+u = 2 e w = -1 para Peng-Robinson). Em vez de np.roots, que resolve um
+problema de autovalores para cada estado, as raízes são calculadas pelas
+fórmulas de Cardano e trigonométrica para todos os estados de uma vez e
+refinadas pelo método de Newton. Em Z os coeficientes são da ordem de 1, o
+que evita a perda de precisão do polinômio em V.
+"""
+
+import numpy as np
+
+from ._raizes import raizes_cubicas
+
+R = 0.082057    #[L atm/(K mol)]
+
+# (u, w) de cada família
+PARAMETROS_UW = {
+    'vdw': (0., 0.),
+    'rk': (1., 0.),
+    'srk': (1., 0.),
+    'pr': (2., -1.),
+}
+
+
+def coeficientes(A, B, u=0., w=0.):
+    """Coeficientes (c2, c1, c0) do polinômio mônico em Z."""
+    A, B = np.asarray(A, dtype=float), np.asarray(B, dtype=float)
+    c2 = -(1 + B - u*B)
+    c1 = A + w*B**2 - u*B - u*B**2
+    c0 = -(A*B + w*B**2 + w*B**3)
+    return c2, c1, c0
+
+
+def raizes_reais(c2, c1, c0, polimento=2):
+    """Raízes reais de Z**3 + c2 Z**2 + c1 Z + c0, formato (..., 3), com nan.
+
+    As raízes de Cardano são refinadas por polimento passos de Newton.
+    """
+    c2, c1, c0 = (np.asarray(c, dtype=float)[..., None] for c in (c2, c1, c0))
+    Z = raizes_cubicas(c2[..., 0], c1[..., 0], c0[..., 0])
+    for _ in range(polimento):
+        f = ((Z + c2)*Z + c1)*Z + c0
+        df = (3*Z + 2*c2)*Z + c1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            passo = f/df
+        # raízes duplas (df = 0) ficam como estão
+        Z = np.where(np.isfinite(passo), Z - passo, Z)
+    return Z
+
+
+def ln_phi(Z, A, B, u=0., w=0.):
+    """ln do coeficiente de fugacidade de um componente puro."""
+    Z, A, B = (np.asarray(v, dtype=float) for v in (Z, A, B))
+    delta = np.sqrt(u**2 - 4*w)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if delta == 0:
+            atrativo = A/Z
+        else:
+            atrativo = A/(B*delta)*np.log((2*Z + B*(u + delta))/(2*Z + B*(u - delta)))
+        return Z - 1 - np.log(Z - B) - atrativo
+
+
+def raizes_Z(A, B, u=0., w=0., polimento=2):
+    """Raízes físicas (Z > B) em ordem crescente, formato (..., 3), com nan."""
+    B = np.asarray(B, dtype=float)
+    Z = raizes_reais(*coeficientes(A, B, u, w), polimento=polimento)
+    Z = np.where(Z > B[..., None], Z, np.nan)
+    return np.sort(Z, axis=-1)
+
+
+def seleciona(Z, A, B, u=0., w=0., fase='estavel'):
+    """Escolhe a raiz de líquido (menor), de vapor (maior) ou a estável.
+
+    Z é a saída de raizes_Z. A raiz estável é a de menor ln phi (menor energia
+    de Gibbs) entre a de líquido e a de vapor.
+    """
+    liquido = np.nanmin(Z, axis=-1, initial=np.inf)
+    vapor = np.nanmax(Z, axis=-1, initial=-np.inf)
+    liquido = np.where(np.isfinite(liquido), liquido, np.nan)
+    vapor = np.where(np.isfinite(vapor), vapor, np.nan)
+    if fase == 'liquido':
+        return liquido
+    if fase == 'vapor':
+        return vapor
+    if fase != 'estavel':
+        raise ValueError("fase deve ser 'liquido', 'vapor' ou 'estavel'")
+    duas = liquido < vapor
+    if not np.any(duas):
+        return vapor
+    phi_l = ln_phi(liquido, A, B, u, w)
+    phi_v = ln_phi(vapor, A, B, u, w)
+    return np.where(duas & (phi_l < phi_v), liquido, vapor)
+
+
+def fator_Z(A, B, u=0., w=0., fase='estavel', polimento=2):
+    """Fator de compressibilidade na fase pedida."""
+    return seleciona(raizes_Z(A, B, u, w, polimento), A, B, u, w, fase)
+
+
+def volume_vdw(T, p, a, b, fase='estavel', R=R):
+    """Volume molar de van der Waals (L/mol) para T (K) e p (atm).
+
+    a em L**2 atm/mol**2 e b em L/mol, como no exemplo do capítulo de gases
+    reais; todos os argumentos podem ser vetores.
+    """
+    T, p = np.asarray(T, dtype=float), np.asarray(p, dtype=float)
+    RT = R*T
+    A = a*p/RT**2
+    B = b*p/RT
+    return fator_Z(A, B, fase=fase)*RT/p
@@ -0,0 +1,65 @@
+"""Diagramas T-x-y e P-x-y de misturas binárias ideais (Lei de Raoult).
+
+As curvas de bolha e de orvalho são calculadas em uma única passagem
+vetorizada sobre a malha de composições. As malhas calculadas ficam guardadas
+em disco, identificadas pelos coeficientes de Antoine e pela malha, e são
+reaproveitadas nas chamadas seguintes.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from . import _cache
+from .raoult import pressao_bolha, temperatura_bolha
+
+DiagramaTxy = namedtuple('DiagramaTxy', 'x y T')
+DiagramaPxy = namedtuple('DiagramaPxy', 'x y P')
+
+
+def malha(n=101):
+    """Malha uniforme de n frações molares do componente 1 entre 0 e 1."""
+    return np.linspace(0., 1., n)
+
+
+def _binaria(x, A, B, C):
+    A, B, C = (np.asarray(v, dtype=float) for v in (A, B, C))
+    if A.shape != (2,) or B.shape != (2,) or C.shape != (2,):
+        raise ValueError('os diagramas são definidos para misturas binárias')
+    x = malha() if x is None else np.asarray(x, dtype=float)
+    return x, A, B, C
+
+
+def diagrama_Txy(A, B, C, P=760., x=None, cache=None):
+    """Diagrama T-x-y (T em ºC) de uma mistura binária ideal a P (torr).
+
+    x é a malha de frações molares do componente 1 no líquido (padrão:
+    malha(101)). A curva de orvalho é dada pelos pares (y, T), pois o vapor em
+    equilíbrio com o líquido x está no seu ponto de orvalho na mesma T.
+    cache é o diretório do cache em disco; cache=False desativa o cache.
+    """
+    x, A, B, C = _binaria(x, A, B, C)
+
+    def calcula():
+        T, y = temperatura_bolha(np.stack([x, 1 - x], axis=-1), P, A, B, C)
+        return {'x': x, 'y': y[..., 0], 'T': T}
+
+    nome = 'Txy-' + _cache.chave(A, B, C, P, x)
+    tabela = _cache.carrega_ou_calcula(nome, calcula, cache)
+    return DiagramaTxy(tabela['x'], tabela['y'], tabela['T'])
+
+
+def diagrama_Pxy(A, B, C, T=25., x=None, cache=None):
+    """Diagrama P-x-y (P em torr) de uma mistura binária ideal a T (ºC).
+
+    Os argumentos têm o mesmo significado que em diagrama_Txy.
+    """
+    x, A, B, C = _binaria(x, A, B, C)
+
+    def calcula():
+        P, y = pressao_bolha(np.stack([x, 1 - x], axis=-1), T, A, B, C)
+        return {'x': x, 'y': y[..., 0], 'P': P}
+
+    nome = 'Pxy-' + _cache.chave(A, B, C, T, x)
+    tabela = _cache.carrega_ou_calcula(nome, calcula, cache)
+    return DiagramaPxy(tabela['x'], tabela['y'], tabela['P'])
@@ -0,0 +1,202 @@
+"""Equações de estado cúbicas: van der Waals, Redlich-Kwong, Soave e Peng-Robinson.
+
+Todas são escritas na forma
+
+    p = RT/(V - b) - a(T)/(V**2 + u b V + w b**2),     a(T) = a_c alpha(T)
+
+e compartilham as mesmas rotinas vetorizadas: raízes em Z (módulo cubica),
+volume molar, coeficiente de fugacidade, propriedades residuais e trabalho
+reversível isotérmico. Com
+
+    I(V) = integral de V a infinito de dV/(V**2 + u b V + w b**2)
+         = ln((2V + b(u + d))/(2V + b(u - d)))/(b d),   d = sqrt(u**2 - 4w)
+
+(I = 1/V para van der Waals) as propriedades residuais a T e p são
+
+    G_res = RT(Z - 1 - ln(Z - B)) - a I
+    H_res = RT(Z - 1) + (T da/dT - a) I
+    S_res = R ln(Z - B) + da/dT I
+
+nas unidades de RT (J/mol com R = 8.314, L atm/mol com R = 0.082057).
+
+As constantes de cada substância (a_c, b, m) são calculadas na construção e
+a(T) é calculado no formato de T, antes da combinação com p: uma malha
+T[:, None] x p[None, :] calcula alpha apenas len(T) vezes, e para T escalar o
+resultado fica guardado entre as chamadas.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from . import cubica
+
+R = 0.082057    #[L atm/(K mol)]
+
+Residuais = namedtuple('Residuais', 'H S G')
+
+
+class Cubica:
+    """Equação cúbica genérica com parâmetros a_c, b e alpha(T) = 1.
+
+    As subclasses definem u, w, as constantes Omega_a e Omega_b usadas por
+    de_criticas e a função alpha(T).
+    """
+
+    u = 0.
+    w = 0.
+    Omega_a = 27/64
+    Omega_b = 1/8
+
+    def __init__(self, a, b, Tc=1., omega=0., R=R):
+        self.a_c = float(a)
+        self.b = float(b)
+        self.Tc = float(Tc)
+        self.omega = float(omega)
+        self.R = R
+        self.delta = np.sqrt(self.u**2 - 4*self.w)
+        self._cache_a = {}
+
+    @classmethod
+    def de_criticas(cls, Tc, Pc, omega=0., R=R):
+        """Parâmetros a partir da temperatura e pressão críticas (unidades de R)."""
+        return cls(cls.Omega_a*R**2*Tc**2/Pc, cls.Omega_b*R*Tc/Pc, Tc, omega, R)
+
+    def alpha(self, T):
+        """alpha(T) e d alpha/dT."""
+        T = np.asarray(T, dtype=float)
+        return np.ones_like(T), np.zeros_like(T)
+
+    def parametros(self, T):
+        """a(T) e da/dT, no formato de T."""
+        T = np.asarray(T, dtype=float)
+        if T.ndim == 0:
+            return self._parametros_escalar(float(T))
+        alpha, dalpha = self.alpha(T)
+        return self.a_c*alpha, self.a_c*dalpha
+
+    def _parametros_escalar(self, T):
+        # a chave inclui as constantes, para que alterá-las não use valores antigos
+        chave = (self.a_c, self.Tc, getattr(self, 'm', 0.), T)
+        valor = self._cache_a.get(chave)
+        if valor is None:
+            if len(self._cache_a) >= 256:
+                self._cache_a.clear()
+            alpha, dalpha = self.alpha(T)
+            valor = self._cache_a[chave] = (self.a_c*alpha, self.a_c*dalpha)
+        return valor
+
+    def pressao(self, T, V):
+        """Pressão para T e volume molar V."""
+        T, V = np.asarray(T, dtype=float), np.asarray(V, dtype=float)
+        a, _ = self.parametros(T)
+        b = self.b
+        return self.R*T/(V - b) - a/(V**2 + self.u*b*V + self.w*b**2)
+
+    def AB(self, T, p):
+        """Parâmetros adimensionais A = a p/(RT)**2 e B = b p/(RT)."""
+        T, p = np.asarray(T, dtype=float), np.asarray(p, dtype=float)
+        a, _ = self.parametros(T)
+        RT = self.R*T
+        return a*p/RT**2, self.b*p/RT
+
+    def Z(self, T, p, fase='estavel'):
+        """Fator de compressibilidade na fase 'liquido', 'vapor' ou 'estavel'."""
+        A, B = self.AB(T, p)
+        return cubica.fator_Z(A, B, self.u, self.w, fase)
+
+    def volume(self, T, p, fase='estavel'):
+        """Volume molar."""
+        T, p = np.asarray(T, dtype=float), np.asarray(p, dtype=float)
+        return self.Z(T, p, fase)*self.R*T/p
+
+    def ln_phi(self, T, p, fase='estavel'):
+        """ln do coeficiente de fugacidade."""
+        A, B = self.AB(T, p)
+        Z = cubica.fator_Z(A, B, self.u, self.w, fase)
+        return cubica.ln_phi(Z, A, B, self.u, self.w)
+
+    def _integral(self, V):
+        b = self.b
+        if self.delta == 0:
+            return 1/V
+        d = self.delta
+        return np.log((2*V + b*(self.u + d))/(2*V + b*(self.u - d)))/(b*d)
+
+    def residuais(self, T, p, fase='estavel'):
+        """Entalpia, entropia e energia de Gibbs residuais a T e p."""
+        T, p = np.asarray(T, dtype=float), np.asarray(p, dtype=float)
+        a, da = self.parametros(T)
+        RT = self.R*T
+        B = self.b*p/RT
+        Z = cubica.fator_Z(a*p/RT**2, B, self.u, self.w, fase)
+        I = self._integral(Z*RT/p)
+        H = RT*(Z - 1) + (T*da - a)*I
+        S = self.R*np.log(Z - B) + da*I
+        G = RT*(Z - 1 - np.log(Z - B)) - a*I
+        return Residuais(H, S, G)
+
+    def trabalho(self, T, V1, V2, n=1.):
+        """Trabalho reversível isotérmico de V1 a V2 (volumes totais), W = -int p dV."""
+        T = np.asarray(T, dtype=float)
+        V1 = np.asarray(V1, dtype=float)/n
+        V2 = np.asarray(V2, dtype=float)/n
+        a, _ = self.parametros(T)
+        b = self.b
+        return n*(-self.R*T*np.log((V2 - b)/(V1 - b)) + a*(self._integral(V1) - self._integral(V2)))
+
+
+class VanDerWaals(Cubica):
+    """p = RT/(V - b) - a/V**2."""
+
+
+class RedlichKwong(Cubica):
+    """p = RT/(V - b) - a/(T**0.5 V (V + b)).
+
+    Construída com (a, b) da forma original, a inclui o fator T**0.5 (Tc = 1).
+    """
+
+    u = 1.
+    Omega_a = 0.42748
+    Omega_b = 0.08664
+
+    def alpha(self, T):
+        T = np.asarray(T, dtype=float)
+        alpha = (self.Tc/T)**0.5
+        return alpha, -0.5*alpha/T
+
+
+class _AlphaSoave(Cubica):
+    # alpha = (1 + m (1 - sqrt(T/Tc)))**2, com m dado pelo fator acêntrico
+
+    coef_m = (0., 0., 0.)
+
+    def __init__(self, a, b, Tc=1., omega=0., R=R):
+        super().__init__(a, b, Tc, omega, R)
+        c0, c1, c2 = self.coef_m
+        self.m = c0 + c1*self.omega + c2*self.omega**2
+
+    def alpha(self, T):
+        T = np.asarray(T, dtype=float)
+        raiz = np.sqrt(T/self.Tc)
+        f = 1 + self.m*(1 - raiz)
+        return f**2, -f*self.m*raiz/T
+
+
+class SoaveRedlichKwong(_AlphaSoave):
+    """Redlich-Kwong com a função alpha de Soave."""
+
+    u = 1.
+    Omega_a = 0.42748
+    Omega_b = 0.08664
+    coef_m = (0.480, 1.574, -0.176)
+
+
+class PengRobinson(_AlphaSoave):
+    """p = RT/(V - b) - a(T)/(V**2 + 2bV - b**2)."""
+
+    u = 2.
+    w = -1.
+    Omega_a = 0.45724
+    Omega_b = 0.07780
+    coef_m = (0.37464, 1.54226, -0.26992)
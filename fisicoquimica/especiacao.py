@@ -0,0 +1,151 @@
+"""Especiação ácido-base em água para qualquer combinação de ácidos e gases.
+
+Cada ácido (mono ou poliprótico) é descrito pelas suas constantes de
+dissociação Ka_1, ..., Ka_m e por uma das condições:
+
+    sistema aberto: gás com constante de Henry Kh (mol L-1 atm-1) e pressão
+                    parcial p (atm), logo [H_mA] = Kh p
+    sistema fechado: concentração total C (mol/L)
+
+Pelas leis de ação das massas a concentração de cada espécie H_(m-j)A^(j-)
+é uma função explícita de [H+], de forma que o balanço de carga
+
+    [H+] + d - Kw/[H+] - sum(j [H_(m-j)A^(j-)]) = 0
+
+com d o excesso de cátions de eletrólitos fortes, é uma equação em uma única
+incógnita. Ela é resolvida em u = ln[H+], na forma
+ln(cargas positivas) - ln(cargas negativas) = 0, que é monótona e quase
+linear, pelo método de Newton com derivada analítica protegido por
+bissecção. Todos os parâmetros podem ser vetores.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from ._raizes import newton_intervalo
+
+Kw = 1.0e-14
+LN10 = np.log(10.)
+
+Acido = namedtuple('Acido', 'Ka Kh p C nome', defaults=(None, None, None, ''))
+Acido.__doc__ = """Ácido com constantes Ka (sequência) em sistema aberto (Kh, p) ou fechado (C)."""
+
+Especiacao = namedtuple('Especiacao', 'H pH OH especies')
+
+# gás: (Kh [mol/(L atm)], constantes de dissociação)
+GASES_ACIDOS = {
+    'CO2': (3.4e-2, (4.5e-7, 7.0e-11)),
+    'SO2': (1.23, (1.3e-2, 6.6e-8)),
+    'HNO3': (2.1e5, (20.,)),
+    'HCl': (1.9e1, (1.0e6,)),
+}
+
+# limites de [H+] (mol/L) usados como intervalo inicial
+H_MIN = 1e-20
+H_MAX = 1e2
+
+
+def gas_acido(nome, p):
+    """Acido em sistema aberto para um gás de GASES_ACIDOS com pressão p (atm)."""
+    Kh, Ka = GASES_ACIDOS[nome]
+    return Acido(Ka, Kh=Kh, p=p, nome=nome)
+
+
+class _Termo:
+    """Parâmetros de um ácido preparados para o cálculo em escala logarítmica."""
+
+    def __init__(self, acido):
+        log_Ka = [np.log(np.asarray(k, dtype=float)) for k in acido.Ka]
+        # log beta_j = sum(log Ka_1..Ka_j), espécies no último eixo
+        self.log_beta = np.cumsum(np.stack(np.broadcast_arrays(0., *log_Ka), axis=-1), axis=-1)
+        self.j = np.arange(self.log_beta.shape[-1], dtype=float)
+        if acido.C is not None:
+            self.aberto = False
+            self.total = np.asarray(acido.C, dtype=float)
+        elif acido.Kh is not None and acido.p is not None:
+            self.aberto = True
+            self.total = np.asarray(acido.Kh, dtype=float)*np.asarray(acido.p, dtype=float)
+        else:
+            raise ValueError('informe C (sistema fechado) ou Kh e p (sistema aberto) para %s'
+                             % (acido.nome or 'o ácido'))
+
+    def especies(self, u):
+        """Concentrações das espécies H_mA, ..., A^(m-) (último eixo)."""
+        t = self.log_beta - self.j*np.asarray(u)[..., None]
+        if self.aberto:
+            return self.total[..., None]*np.exp(t)
+        t = t - t.max(axis=-1, keepdims=True)
+        alfa = np.exp(t)
+        return self.total[..., None]*alfa/alfa.sum(axis=-1, keepdims=True)
+
+    def carga(self, u):
+        """Carga negativa sum(j c_j) e sua derivada em relação a u = ln[H+]."""
+        c = self.especies(u)
+        q = (self.j*c).sum(axis=-1)
+        q2 = (self.j**2*c).sum(axis=-1)
+        if self.aberto:
+            return q, -q2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n_medio = np.where(self.total > 0, q/self.total, 0.)
+        return q, -(q2 - n_medio*q)
+
+
+def balanco_carga(u, acidos, forte=0., Kw=Kw):
+    """Resíduo do balanço de carga e sua derivada em u = ln[H+].
+
+    acidos pode ser uma lista de Acido ou de termos já preparados por prepara.
+    """
+    termos = prepara(acidos)
+    H = np.exp(u)
+    OH = Kw/H
+    F = H + forte - OH
+    dF = H + OH
+    for termo in termos:
+        q, dq = termo.carga(u)
+        F = F - q
+        dF = dF - dq
+    return F, dF
+
+
+def _balanco_log(u, termos, forte, Kw):
+    # o balanço escrito como ln(cargas positivas) - ln(cargas negativas) é
+    # quase linear em u longe da raiz, o que reduz muito o número de passos
+    H = np.exp(u)
+    OH = Kw/H
+    positivas = H + np.maximum(forte, 0.)
+    negativas = OH + np.maximum(-np.asarray(forte), 0.)
+    d_negativas = -OH
+    for termo in termos:
+        q, dq = termo.carga(u)
+        negativas = negativas + q
+        d_negativas = d_negativas + dq
+    return (np.log(positivas) - np.log(negativas),
+            H/positivas - d_negativas/negativas)
+
+
+def prepara(acidos):
+    """Converte uma lista de Acido nos termos usados internamente (uma vez só)."""
+    return [a if isinstance(a, _Termo) else _Termo(a) for a in acidos]
+
+
+def especiacao(acidos, forte=0., Kw=Kw, H0=None, tol=1e-12, maxiter=100):
+    """Resolve o balanço de carga para a lista de ácidos.
+
+    forte é o excesso de cátions de eletrólitos fortes (mol/L) e H0 uma
+    estimativa opcional de [H+]. Retorna Especiacao(H, pH, OH, especies), em
+    que especies é uma lista com as concentrações de cada ácido, do ácido não
+    dissociado à base conjugada de maior carga.
+    """
+    termos = prepara(acidos)
+    forma = np.broadcast_shapes(np.shape(forte), np.shape(Kw),
+                                *(np.shape(t.total) for t in termos),
+                                *(t.log_beta.shape[:-1] for t in termos))
+    u_min = np.full(forma, np.log(H_MIN))
+    u_max = np.full(forma, np.log(H_MAX))
+    u0 = None if H0 is None else np.log(H0)
+
+    u = newton_intervalo(lambda u: _balanco_log(u, termos, forte, Kw), u_min, u_max, u0,
+                         tol=tol, maxiter=maxiter)
+    H = np.exp(u)
+    return Especiacao(H, -u/LN10, Kw/H, [t.especies(u) for t in termos])
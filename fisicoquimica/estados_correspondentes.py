@@ -0,0 +1,198 @@
+"""Fator de compressibilidade generalizado (Lee-Kesler) por tabelas reduzidas.
+
+Pelo princípio dos estados correspondentes de três parâmetros,
+
+    Z = Z0(Tr, Pr) + omega Z1(Tr, Pr),     Tr = T/Tc,  Pr = P/Pc
+
+com as mesmas formas para (H - H_gi)/(R Tc) e ln phi. Lee e Kesler obtêm Z0
+do fluido simples (omega = 0) e Z1 = (Z_ref - Z0)/omega_ref do fluido de
+referência (n-octano, omega_ref = 0,3978) por uma equação de Benedict-Webb-Rubin
+modificada em Vr = Pc V/(R Tc):
+
+    Z = 1 + B/Vr + C/Vr**2 + D/Vr**5 + c4/(Tr**3 Vr**2) (beta + gamma/Vr**2) exp(-gamma/Vr**2)
+
+Resolver essa equação para cada estado é caro. LeeKesler resolve-a uma única
+vez, em uma malha uniforme de (Tr, Pr), para os dois fluidos e para os ramos
+de líquido e de vapor, e guarda as tabelas no cache em disco. Uma consulta é
+uma interpolação bilinear: o índice da célula é calculado diretamente, e as
+12 grandezas de uma célula (2 ramos x 2 fluidos x Z, H, ln phi) são
+contíguas. O ramo de cada estado é escolhido pela pressão de vapor de
+Lee-Kesler do gás; fora da faixa das tabelas o resultado é nan.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from . import _cache
+from ._raizes import newton_intervalo
+
+R = 8.314   #[J/(mol K)]
+
+OMEGA_REF = 0.3978
+
+# (b1, b2, b3, b4, c1, c2, c3, c4, d1, d2, beta, gamma)
+CONSTANTES = {
+    'simples': (0.1181193, 0.265728, 0.154790, 0.030323, 0.0236744, 0.0186984,
+                0.0, 0.042724, 0.155488e-4, 0.623689e-4, 0.65392, 0.060167),
+    'referencia': (0.2026579, 0.331511, 0.027655, 0.203488, 0.0313385, 0.0503618,
+                   0.016901, 0.041577, 0.48736e-4, 0.0740336e-4, 1.226, 0.03754),
+}
+
+Generalizado = namedtuple('Generalizado', 'Z H_res ln_phi')
+
+
+def pressao_vapor(Tr, omega):
+    """Pressão de vapor reduzida pela correlação de Lee-Kesler."""
+    Tr = np.asarray(Tr, dtype=float)
+    f0 = 5.92714 - 6.09648/Tr - 1.28862*np.log(Tr) + 0.169347*Tr**6
+    f1 = 15.2518 - 15.6875/Tr - 13.4721*np.log(Tr) + 0.43577*Tr**6
+    return np.exp(f0 + omega*f1)
+
+
+def _coeficientes(Tr, constantes):
+    b1, b2, b3, b4, c1, c2, c3, c4, d1, d2, beta, gamma = constantes
+    B = b1 - b2/Tr - b3/Tr**2 - b4/Tr**3
+    C = c1 - c2/Tr + c3/Tr**3
+    D = d1 + d2/Tr
+    return B, C, D
+
+
+def _pressao(Vr, Tr, constantes):
+    # Pr(Vr) e dPr/dVr
+    c4, beta, gamma = constantes[7], constantes[10], constantes[11]
+    B, C, D = _coeficientes(Tr, constantes)
+    e = np.exp(-gamma/Vr**2)
+    g = beta/Vr**2 + gamma/Vr**4
+    Z = 1 + B/Vr + C/Vr**2 + D/Vr**5 + c4/Tr**3*g*e
+    dg = -2*beta/Vr**3 - 4*gamma/Vr**5
+    dZ = -B/Vr**2 - 2*C/Vr**3 - 5*D/Vr**6 + c4/Tr**3*e*(dg + 2*gamma/Vr**3*g)
+    return Tr*Z/Vr, Tr*(dZ/Vr - Z/Vr**2)
+
+
+def _propriedades(Vr, Tr, constantes):
+    # Z, (H - H_gi)/(R Tc) e ln phi em Vr e Tr
+    b1, b2, b3, b4, c1, c2, c3, c4, d1, d2, beta, gamma = constantes
+    B, C, D = _coeficientes(Tr, constantes)
+    x = gamma/Vr**2
+    Z = 1 + B/Vr + C/Vr**2 + D/Vr**5 + c4/(Tr**3*Vr**2)*(beta + x)*np.exp(-x)
+    E = c4/(2*Tr**3*gamma)*(beta + 1 - (beta + 1 + x)*np.exp(-x))
+    H = Tr*(Z - 1 - (b2 + 2*b3/Tr + 3*b4/Tr**2)/(Tr*Vr) - (c2 - 3*c3/Tr**2)/(2*Tr*Vr**2)
+            + d2/(5*Tr*Vr**5) + 3*E)
+    ln_phi = Z - 1 - np.log(Z) + B/Vr + C/(2*Vr**2) + D/(5*Vr**5) + E
+    return Z, H, ln_phi
+
+
+def _volumes(Tr, Pr, constantes, Vr=np.geomspace(0.02, 1e3, 4000)):
+    # raízes Vr de líquido (menor) e de vapor (maior) na malha Tr x Pr, com nan
+    # onde o ramo não existe. Para cada Tr a isoterma é amostrada em Vr; o ramo
+    # de vapor é o trecho decrescente após o último máximo local e o de
+    # líquido o trecho decrescente antes do primeiro mínimo
+    nT, nP = len(Tr), len(Pr)
+    a = np.full((2, nT, nP), np.nan)
+    b = np.full((2, nT, nP), np.nan)
+    for i, T in enumerate(Tr):
+        p = _pressao(Vr, T, constantes)[0]
+        sobe = np.flatnonzero(np.diff(p) > 0)
+        inicio = sobe[-1] + 1 if len(sobe) else 0
+        fim = sobe[0] if len(sobe) else len(Vr) - 1
+        for ramo, (j0, j1) in enumerate(((0, fim), (inicio, len(Vr) - 1))):
+            # trecho decrescente: p[j0] >= Pr >= p[j1]
+            trecho = -p[j0:j1 + 1]
+            k = np.searchsorted(trecho, -Pr)
+            ok = (k > 0) & (k <= j1 - j0)
+            k = j0 + np.clip(k, 1, j1 - j0)
+            a[ramo, i] = np.where(ok, Vr[k - 1], np.nan)
+            b[ramo, i] = np.where(ok, Vr[k], np.nan)
+
+    ok = np.isfinite(a)
+    T = np.broadcast_to(Tr[:, None], (2, nT, nP))[ok]
+    P = np.broadcast_to(Pr, (2, nT, nP))[ok]
+
+    def residuo(V):
+        p, dp = _pressao(V, T, constantes)
+        return p - P, dp
+
+    V = np.full((2, nT, nP), np.nan)
+    V[ok] = newton_intervalo(residuo, a[ok], b[ok], tol=1e-13)
+    return V
+
+
+def calcula_tabelas(Tr, Pr):
+    """Tabelas (2 ramos, len(Tr), len(Pr), 2 fluidos, 3 grandezas).
+
+    Ramo 0 é o líquido e 1 o vapor; fluido 0 é o simples e 1 o de referência;
+    as grandezas são Z, (H - H_gi)/(R Tc) e ln phi. Onde um ramo não existe é
+    usado o outro, e em Pr = 0 o vapor é o gás ideal.
+    """
+    Tr, Pr = np.asarray(Tr, dtype=float), np.asarray(Pr, dtype=float)
+    tabela = np.empty((2, len(Tr), len(Pr), 2, 3))
+    for f, nome in enumerate(('simples', 'referencia')):
+        constantes = CONSTANTES[nome]
+        V = _volumes(Tr, Pr, constantes)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            props = np.stack(_propriedades(V, Tr[:, None], constantes), axis=-1)
+        props[1][:, Pr == 0] = (1., 0., 0.)
+        for ramo in (0, 1):
+            falta = np.isnan(props[ramo, ..., 0])
+            props[ramo][falta] = props[1 - ramo][falta]
+        tabela[:, :, :, f] = props
+    return tabela
+
+
+class LeeKesler:
+    """Z, H residual e ln phi generalizados por interpolação em tabelas de Lee-Kesler.
+
+    As tabelas cobrem Tr_min <= Tr <= Tr_max e 0 <= Pr <= Pr_max em malhas
+    uniformes com nT x nP pontos. cache é o diretório do cache em disco
+    (cache=False recalcula as tabelas).
+    """
+
+    def __init__(self, Tr_min=0.3, Tr_max=4., nT=371, Pr_max=10., nP=401, cache=None):
+        self.Tr = np.linspace(Tr_min, Tr_max, nT)
+        self.Pr = np.linspace(0., Pr_max, nP)
+        nome = 'lee-kesler-' + _cache.chave(self.Tr, self.Pr)
+        tabela = _cache.carrega_ou_calcula(
+            nome, lambda: {'tabela': calcula_tabelas(self.Tr, self.Pr)}, cache)['tabela']
+        # linhas (ramo, iT, iP) com as 6 grandezas dos dois fluidos contíguas
+        self.tabela = np.ascontiguousarray(tabela.reshape(-1, 6))
+        self.hT = self.Tr[1] - self.Tr[0]
+        self.hP = self.Pr[1] - self.Pr[0]
+
+    def reduzidas(self, Tr, Pr, omega=0.):
+        """Z, (H - H_gi)/(R Tc) e ln phi em (Tr, Pr) para o fator acêntrico omega."""
+        Tr, Pr, omega = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (Tr, Pr, omega)))
+        nT, nP = len(self.Tr), len(self.Pr)
+        s = (Tr - self.Tr[0])/self.hT
+        r = Pr/self.hP
+        fora = ~((s >= 0) & (s <= nT - 1) & (r >= 0) & (r <= nP - 1))
+        i = np.clip(s, 0, nT - 2).astype(np.intp)
+        j = np.clip(r, 0, nP - 2).astype(np.intp)
+        t = (s - i)[..., None]
+        u = (r - j)[..., None]
+
+        with np.errstate(invalid='ignore', over='ignore'):
+            liquido = (Tr < 1) & (Pr > pressao_vapor(Tr, omega))
+        k = (np.where(liquido, 0, nT) + i)*nP + j
+        c = self.tabela
+        valor = ((1 - t)*((1 - u)*np.take(c, k, axis=0) + u*np.take(c, k + 1, axis=0))
+                 + t*((1 - u)*np.take(c, k + nP, axis=0) + u*np.take(c, k + nP + 1, axis=0)))
+
+        # combinação linear no fator acêntrico
+        peso = (omega/OMEGA_REF)[..., None]
+        valor = valor[..., :3] + peso*(valor[..., 3:] - valor[..., :3])
+        valor = np.where(fora[..., None], np.nan, valor)
+        return Generalizado(valor[..., 0], valor[..., 1], valor[..., 2])
+
+    def __call__(self, T, P, Tc, Pc, omega=0.):
+        """Z, H - H_gi (J/mol) e ln phi em T (K) e P para o gás (Tc, Pc, omega).
+
+        P e Pc na mesma unidade; todos os argumentos podem ser vetores.
+        """
+        T, Tc = np.asarray(T, dtype=float), np.asarray(Tc, dtype=float)
+        Z, H, ln_phi = self.reduzidas(T/Tc, np.asarray(P, dtype=float)/Pc, omega)
+        return Generalizado(Z, H*R*Tc, ln_phi)
+
+    def Z(self, T, P, Tc, Pc, omega=0.):
+        """Fator de compressibilidade."""
+        return self(T, P, Tc, Pc, omega).Z
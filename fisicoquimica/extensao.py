@@ -0,0 +1,144 @@
+"""Avanço de reação de gases ideais pelas raízes de um polinômio.
+
+Para uma reação com coeficientes estequiométricos nu_i (negativos para os
+reagentes), alimentação n0_i e avanço e, as quantidades são n_i = n0_i + nu_i e
+e o total é n_t = n_t0 + dnu e, com dnu = sum(nu_i). A lei da ação das massas
+
+    prod(n_i**nu_i) n_t**(-dnu) = K_x = K (P/P0)**(-dnu)
+
+elevada a uma potência inteira m que torna todos os expoentes inteiros e com
+os termos de expoente negativo passados para o outro lado, é um polinômio em
+e: por exemplo (2e)**2 - K (0,78 - e)(0,21 - e) para a formação do NO e
+e - K (1 - e) para a isomerização do butano. O polinômio é resolvido pela
+fórmula fechada até o segundo grau, pelas fórmulas de Cardano no terceiro, de
+Ferrari no quarto e pelos autovalores da matriz companheira acima disso, e a
+raiz física é a raiz real dentro do intervalo de avanços com todas as
+quantidades não negativas. Como prod(...) é monótono nesse intervalo, ela é
+única; o método de Newton protegido por bissecção refina o resultado.
+"""
+
+from collections import namedtuple
+from fractions import Fraction
+from math import lcm
+
+import numpy as np
+
+from ._raizes import newton_intervalo, raizes_polinomio
+
+P0 = 1.     #[atm] pressão do estado padrão
+
+Extensao = namedtuple('Extensao', 'extensao n y')
+
+
+def expoente_inteiro(nu, max_denominador=100):
+    """Menor inteiro m que torna todos os m nu_i inteiros."""
+    return lcm(*(Fraction(v).limit_denominator(max_denominador).denominator for v in nu))
+
+
+def _multiplica(p, q):
+    # produto de polinômios com coeficientes em ordem crescente no último eixo
+    forma = np.broadcast_shapes(p.shape[:-1], q.shape[:-1])
+    r = np.zeros(forma + (p.shape[-1] + q.shape[-1] - 1,))
+    for j in range(q.shape[-1]):
+        r[..., j:j + p.shape[-1]] += p*q[..., j:j + 1]
+    return r
+
+
+def _potencia(p, k):
+    r = np.ones(p.shape[:-1] + (1,))
+    for _ in range(k):
+        r = _multiplica(r, p)
+    return r
+
+
+def polinomio_extensao(nu, n0, K, P=P0):
+    """Coeficientes (ordem crescente no último eixo) do polinômio em e.
+
+    nu e n0 têm as espécies no último eixo; K e P (atm) podem ser vetores.
+    """
+    nu = np.asarray(nu, dtype=float)
+    n0 = np.asarray(n0, dtype=float)
+    m = expoente_inteiro(nu)
+    dnu = nu.sum()
+    Kx = np.asarray(K, dtype=float)*(np.asarray(P, dtype=float)/P0)**(-dnu)
+
+    # fatores lineares n0_i + nu_i e e n_t0 + dnu e com os expoentes inteiros
+    fatores = [(n0[..., i], nu[i], int(round(m*nu[i]))) for i in range(len(nu))]
+    fatores.append((n0.sum(axis=-1), dnu, -int(round(m*dnu))))
+    esquerda = np.ones((1,))
+    direita = np.ones((1,))
+    for a, b, k in fatores:
+        if k == 0:
+            continue
+        linear = np.stack(np.broadcast_arrays(a, b), axis=-1)
+        if k > 0:
+            esquerda = _multiplica(esquerda, _potencia(linear, k))
+        else:
+            direita = _multiplica(direita, _potencia(linear, -k))
+
+    direita = _multiplica(direita, (Kx**m)[..., None])
+    grau = max(esquerda.shape[-1], direita.shape[-1])
+    forma = np.broadcast_shapes(esquerda.shape[:-1], direita.shape[:-1])
+    c = np.zeros(forma + (grau,))
+    c[..., :esquerda.shape[-1]] += esquerda
+    c[..., :direita.shape[-1]] -= direita
+    return c
+
+
+def limites_extensao(nu, n0):
+    """Menor e maior avanço com todas as quantidades não negativas."""
+    nu = np.asarray(nu, dtype=float)
+    n0 = np.asarray(n0, dtype=float)
+    # espécies inertes (nu = 0) não limitam o avanço
+    ativas = nu != 0
+    limite = -n0[..., ativas]/nu[ativas]
+    e_min = np.where(nu[ativas] > 0, limite, -np.inf).max(axis=-1, initial=-np.inf)
+    e_max = np.where(nu[ativas] < 0, limite, np.inf).min(axis=-1, initial=np.inf)
+    return e_min, e_max
+
+
+def extensao(nu, n0, K, P=P0, tol=1e-12, maxiter=100):
+    """Avanço de equilíbrio da reação nu com alimentação n0, K e P (atm).
+
+    Retorna Extensao(extensao, n, y), com n e y no formato (..., espécies).
+    """
+    nu = np.asarray(nu, dtype=float)
+    n0 = np.asarray(n0, dtype=float)
+    c = polinomio_extensao(nu, n0, K, P)
+    e_min, e_max = limites_extensao(nu, n0)
+    if not (np.all(np.isfinite(e_min)) and np.all(np.isfinite(e_max))):
+        raise ValueError('a reação precisa de reagentes e produtos')
+    raizes = raizes_polinomio(c)
+
+    folga = (1e-9*(e_max - e_min))[..., None]
+    dentro = (raizes >= e_min[..., None] - folga) & (raizes <= e_max[..., None] + folga)
+    e = np.nanmax(np.where(dentro, raizes, np.nan), axis=-1, initial=-np.inf)
+
+    # refinamento pelo método de Newton protegido por bissecção na forma
+    # logarítmica, que corrige o arredondamento das fórmulas (raízes quase
+    # duplas) e resolve os pontos sem raiz encontrada a partir do meio do intervalo
+    e = np.where(np.isfinite(e), e, 0.5*(e_min + e_max))
+    folga = 1e-14*(e_max - e_min)
+    e = newton_intervalo(_residuo_log(nu, n0, K, P), np.broadcast_to(e_min + folga, e.shape),
+                         np.broadcast_to(e_max - folga, e.shape), e, tol=tol, maxiter=maxiter)
+
+    n = n0 + nu*e[..., None]
+    return Extensao(e, n, n/n.sum(axis=-1, keepdims=True))
+
+
+def _residuo_log(nu, n0, K, P):
+    # ln(prod(n_i**nu_i) n_t**(-dnu)) - ln K_x e sua derivada, crescente em e
+    dnu = nu.sum()
+    ln_Kx = np.log(np.asarray(K, dtype=float)) - dnu*np.log(np.asarray(P, dtype=float)/P0)
+    n_t0 = n0.sum(axis=-1)
+
+    def residuo(e):
+        n = n0 + nu*e[..., None]
+        n_t = n_t0 + dnu*e
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # espécies inertes ausentes (n = 0) não contribuem
+            f = np.where(nu != 0, nu*np.log(n), 0.).sum(axis=-1) - dnu*np.log(n_t) - ln_Kx
+            df = np.where(nu != 0, nu**2/n, 0.).sum(axis=-1) - dnu**2/n_t
+        return f, df
+
+    return residuo
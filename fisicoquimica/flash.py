@@ -0,0 +1,118 @@
+"""Flash isotérmico de misturas com espécies de Raoult e de Henry.
+
+As espécies condensáveis seguem a Lei de Raoult, com pressão de vapor dada
+pela equação de Antoine (torr, ºC), e os gases pouco solúveis seguem a Lei de
+Henry, p_i = x_i H_i(T), com
+
+    H(T) = H_ref*exp(C*(1/T_ref - 1/T))     [atm]
+
+Em ambos os casos y_i = K_i x_i e a fração vaporizada V é a raiz da equação
+de Rachford-Rice
+
+    sum(z_i (K_i - 1)/(1 + V (K_i - 1))) = 0
+
+que é monótona em V e é resolvida no intervalo [0, 1] pelo método de Newton
+protegido por bissecção, para todos os estados de uma vez.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from . import henry as _henry
+from ._raizes import newton_intervalo
+from .antoine import REGISTRO
+
+ResultadoFlash = namedtuple('ResultadoFlash', 'V x y K')
+
+
+class Flash:
+    """Flash isotérmico para um conjunto fixo de espécies.
+
+    raoult é a tupla (A, B, C) de coeficientes de Antoine das espécies
+    condensáveis e henry a tupla (H_ref, C, T_ref) dos gases, com H_ref em atm,
+    C em K e T_ref em K (T_ref pode ser omitido, valendo 298.15 K). A ordem das
+    espécies nos resultados é: espécies de Raoult seguidas dos gases de Henry.
+
+    Os parâmetros são convertidos em vetores uma única vez na construção, de
+    forma que chamadas repetidas têm pouco custo fixo.
+    """
+
+    def __init__(self, raoult=None, henry=None):
+        vazio = np.empty(0)
+        if raoult is None:
+            raoult = (vazio, vazio, vazio)
+        if henry is None:
+            henry = (vazio, vazio)
+        self.A, self.B, self.C = (np.atleast_1d(np.asarray(v, dtype=float)) for v in raoult)
+        H_ref, C_H = henry[0], henry[1]
+        T_ref = henry[2] if len(henry) > 2 else 298.15
+        self.H_ref, self.C_H, self.T_ref = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(v, dtype=float)) for v in (H_ref, C_H, T_ref)))
+        self.n = len(self.A) + len(self.H_ref)
+
+    @classmethod
+    def de_especies(cls, raoult=(), henry=(), registro=REGISTRO):
+        """Flash com coeficientes tirados do registro de Antoine e da tabela de Henry."""
+        coef_raoult = registro.coeficientes(list(raoult)) if raoult else None
+        coef_henry = _henry.parametros(list(henry))[:2] if henry else None
+        return cls(coef_raoult, coef_henry)
+
+    def valores_K(self, T, P):
+        """Razões de equilíbrio K_i = y_i/x_i em T (K) e P (atm)."""
+        T = np.asarray(T, dtype=float)[..., None]
+        P = np.asarray(P, dtype=float)[..., None]
+        p_vap = 10**(self.A - self.B/(T - 273.15 + self.C))/760.       #[atm]
+        H = _henry.van_t_hoff(self.H_ref, self.C_H, T, self.T_ref)       #[atm]
+        forma = np.broadcast_shapes(T.shape, P.shape)[:-1]
+        K = np.concatenate([np.broadcast_to(p_vap, forma + self.A.shape),
+                            np.broadcast_to(H, forma + self.H_ref.shape)], axis=-1)
+        return K/P
+
+    def __call__(self, z, T, P, tol=1e-12, maxiter=100):
+        """Flash da alimentação z (frações molares) em T (K) e P (atm).
+
+        z, T e P podem ser vetores de estados (o último eixo de z corresponde
+        às espécies). Retorna ResultadoFlash(V, x, y, K); V = 0 indica líquido
+        abaixo do ponto de bolha e V = 1 vapor acima do ponto de orvalho.
+        """
+        K = self.valores_K(T, P)
+        z = np.asarray(z, dtype=float)
+        z, K = np.broadcast_arrays(z, K)
+        return ResultadoFlash(*rachford_rice(z, K, tol=tol, maxiter=maxiter), K)
+
+
+def rachford_rice(z, K, tol=1e-12, maxiter=100):
+    """Resolve a equação de Rachford-Rice. Retorna a tupla (V, x, y).
+
+    Para estados monofásicos (V = 0 ou V = 1) a composição da outra fase é a da
+    primeira bolha (ou gota) que se formaria.
+    """
+    z, K = np.broadcast_arrays(np.asarray(z, dtype=float), np.asarray(K, dtype=float))
+    Km1 = K - 1
+
+    # estados monofásicos: g(0) <= 0 (líquido) ou g(1) >= 0 (vapor)
+    g0 = (z*Km1).sum(axis=-1)
+    g1 = (z*(1 - 1/K)).sum(axis=-1)
+    liquido = g0 <= 0
+    vapor = g1 >= 0
+    bifasico = ~(liquido | vapor)
+
+    V = np.where(vapor, 1., 0.)
+    zb = z[bifasico]
+    Kb = Km1[bifasico]
+
+    def g(V):
+        d = 1 + V[:, None]*Kb
+        t = zb*Kb/d
+        return t.sum(axis=-1), -(t*Kb/d).sum(axis=-1)
+
+    zero = np.zeros(len(zb))
+    V[bifasico] = newton_intervalo(g, zero, zero + 1, tol=tol, maxiter=maxiter)
+
+    x = z/(1 + V[..., None]*Km1)
+    y = K*x
+    # fora da região bifásica x e y são as composições da fase incipiente
+    x = np.where(vapor[..., None], x/x.sum(axis=-1, keepdims=True), x)
+    y = np.where(liquido[..., None], y/y.sum(axis=-1, keepdims=True), y)
+    return V, x, y
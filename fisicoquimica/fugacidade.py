@@ -0,0 +1,139 @@
+"""Coeficientes de fugacidade em forma fechada e a partir de dados PV tabelados.
+
+O exemplo de gases reais calcula ln phi = integral de 0 a p de (Vm/RT - 1/p) dp
+pela regra do trapézio e obtém um único valor, na última pressão. Aqui ln phi
+é calculado em todas as pressões de uma vez:
+
+    ln_phi_virial   expansões do virial em p (Z = 1 + B'p + C'p**2) ou em 1/Vm
+                    (Z = 1 + B/Vm + C/Vm**2), em forma fechada
+    Mistura         equações cúbicas (módulo eos) para misturas com as regras
+                    de van der Waals, ln phi_i de todos os componentes
+    ln_phi_tabela   dados (p, Vm) tabelados, integrados pela primitiva de um
+                    spline cúbico (ou Simpson/trapézio cumulativos)
+
+Para componentes puros descritos por equações cúbicas use eos.Cubica.ln_phi.
+Todas as funções aceitam vetores: por exemplo, milhares de composições em
+uma malha de pressões são calculadas em uma única chamada.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from scipy.integrate import cumulative_simpson, cumulative_trapezoid
+from scipy.interpolate import CubicSpline
+
+from . import cubica
+from ._raizes import raizes_cubicas
+
+R = 0.08314     #[L bar/(K mol)]
+
+Fugacidade = namedtuple('Fugacidade', 'phi f')
+
+
+def fugacidade(p, ln_phi):
+    """Coeficiente de fugacidade e fugacidade (unidade de p)."""
+    phi = np.exp(ln_phi)
+    return Fugacidade(phi, phi*np.asarray(p, dtype=float))
+
+
+def ln_phi_virial(p, T, B, C=0., serie='volume', R=R):
+    """ln phi de um gás descrito pela expansão do virial truncada.
+
+    serie='pressao': Z = 1 + B p + C p**2 (B' e C' em 1/p e 1/p**2), de forma
+    que ln phi = B p + C p**2/2.
+    serie='volume': Z = 1 + B/Vm + C/Vm**2 (B em L/mol e C em L**2/mol**2);
+    Vm é a maior raiz da cúbica em Z e ln phi = 2B/Vm + 3C/(2Vm**2) - ln Z.
+    """
+    p, T, B, C = (np.asarray(v, dtype=float) for v in (p, T, B, C))
+    if serie == 'pressao':
+        return B*p + C*p**2/2
+    if serie != 'volume':
+        raise ValueError("serie deve ser 'pressao' ou 'volume'")
+    RT = R*T
+    # Z**3 - Z**2 - (B p/RT) Z - C (p/RT)**2 = 0
+    beta, gama = B*p/RT, C*(p/RT)**2
+    Z = raizes_cubicas(-np.ones_like(beta + gama), -beta, -gama)
+    Z = np.nanmax(np.where(Z > 0, Z, np.nan), axis=-1)
+    Vm = Z*RT/np.where(p > 0, p, np.nan)
+    ln_phi = 2*B/Vm + 1.5*C/Vm**2 - np.log(Z)
+    # no limite p -> 0 o gás é ideal
+    return np.where(p > 0, ln_phi, 0.)
+
+
+class Mistura:
+    """Mistura de componentes da mesma família cúbica (módulo eos).
+
+    a_m = sum_ij y_i y_j sqrt(a_i a_j)(1 - k_ij) e b_m = sum_i y_i b_i.
+    """
+
+    def __init__(self, componentes, kij=None):
+        self.componentes = list(componentes)
+        tipos = {type(c) for c in self.componentes}
+        if len(tipos) != 1:
+            raise ValueError('os componentes devem ser da mesma equação de estado')
+        c = self.componentes[0]
+        self.u, self.w, self.R = c.u, c.w, c.R
+        n = len(self.componentes)
+        self.b = np.array([c.b for c in self.componentes])
+        self.kij = np.zeros((n, n)) if kij is None else np.asarray(kij, dtype=float)
+        if self.kij.shape != (n, n):
+            raise ValueError('kij deve ter o formato (n, n)')
+
+    def _aij(self, T):
+        # a_ij(T) no formato T.shape + (n, n)
+        a = np.stack([c.parametros(T)[0] for c in self.componentes], axis=-1)
+        return np.sqrt(a[..., :, None]*a[..., None, :])*(1 - self.kij)
+
+    def ln_phi(self, T, p, y, fase='estavel'):
+        """ln phi_i de cada componente, formato (..., n), na fase pedida.
+
+        y tem os componentes no último eixo; T, p e y são combinados por broadcast.
+        """
+        T, p = np.asarray(T, dtype=float), np.asarray(p, dtype=float)
+        y = np.asarray(y, dtype=float)
+        aij = self._aij(T)
+        soma = np.einsum('...j,...ij->...i', y, aij)
+        a = np.einsum('...i,...i->...', y, soma)
+        b = y @ self.b
+        RT = self.R*T
+        A, B = a*p/RT**2, b*p/RT
+        Z = cubica.fator_Z(A, B, self.u, self.w, fase)
+
+        delta = np.sqrt(self.u**2 - 4*self.w)
+        razao_b = self.b/b[..., None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if delta == 0:
+                termo = (A/Z)[..., None]
+            else:
+                termo = (A/(B*delta)*np.log((2*Z + B*(self.u + delta))/(2*Z + B*(self.u - delta))))[..., None]
+            return (razao_b*(Z - 1)[..., None] - np.log(Z - B)[..., None]
+                    - termo*(2*soma/a[..., None] - razao_b))
+
+
+def ln_phi_tabela(p, V, T, R=R, metodo='spline'):
+    """ln phi em cada pressão da tabela de volumes molares V(p).
+
+    p tem formato (n,) em ordem crescente e V formato (..., n) (vários
+    conjuntos de dados na mesma malha de pressões). O integrando
+    g = V/(RT) - 1/p = (Z - 1)/p é finito em p -> 0, e a integral de 0 até a
+    primeira pressão usa o polinômio extrapolado do primeiro intervalo.
+
+    metodo='spline'   primitiva do spline cúbico de g (padrão)
+    metodo='simpson'  Simpson cumulativo (scipy.integrate.cumulative_simpson)
+    metodo='trapezio' regra do trapézio cumulativa, como no exemplo
+    """
+    p = np.asarray(p, dtype=float)
+    V = np.asarray(V, dtype=float)
+    T = np.asarray(T, dtype=float)
+    g = V/(R*T[..., None] if T.ndim else R*T) - 1/p
+    if metodo == 'spline':
+        primitiva = CubicSpline(p, g, axis=-1).antiderivative()
+        return primitiva(p) - primitiva(0.)[..., None]
+    if metodo == 'simpson':
+        integral = cumulative_simpson(g, x=p, axis=-1, initial=0.)
+    elif metodo == 'trapezio':
+        integral = cumulative_trapezoid(g, x=p, axis=-1, initial=0.)
+    else:
+        raise ValueError("metodo deve ser 'spline', 'simpson' ou 'trapezio'")
+    # de 0 à primeira pressão com g constante
+    return integral + g[..., :1]*p[0]
@@ -0,0 +1,200 @@
+"""Equilíbrio químico de misturas de gases ideais por minimização de Gibbs.
+
+Em vez de escrever a equação do avanço de cada reação, como no capítulo de
+equilíbrio químico, minimiza-se
+
+    G/RT = sum(n_i (g_i + ln(P/P0) + ln(n_i/n_t)))
+
+sujeito à conservação dos elementos, sum(a_ki n_i) = b_k, em que g_i é o
+potencial químico padrão da espécie i dividido por RT e a_ki o número de
+átomos do elemento k na espécie i. Qualquer número de reações simultâneas
+fica descrito pela lista de espécies.
+
+O mínimo é calculado pelo método RAND (White, Johnson e Dantzig) com as
+quantidades em escala logarítmica, como no programa CEA da NASA: a cada
+iteração um sistema linear de ordem (elementos + 1) dá os multiplicadores de
+Lagrange, e a correção Delta ln n_i é amortecida para limitar a variação das
+espécies principais e o crescimento das espécies em traço. Os sistemas de
+todos os pontos de uma malha T x P são resolvidos juntos por np.linalg.solve.
+
+Os potenciais padrão são calculados a partir de Delta_fG e Delta_fH a 298,15 K
+supondo Delta_fH constante (equação de Gibbs-Helmholtz integrada):
+
+    Delta_fG(T) = Delta_fH + (Delta_fG(298) - Delta_fH) T/298,15
+"""
+
+import re
+from collections import namedtuple
+
+import numpy as np
+
+R = 8.314           #[J/(mol K)]
+T_REF = 298.15      #[K]
+P0 = 1.             #[bar] pressão do estado padrão
+
+# espécie: (fórmula, Delta_fG [kJ/mol], Delta_fH [kJ/mol]) para gás ideal a 298,15 K
+FORMACAO = {
+    'N2': ('N2', 0., 0.),
+    'O2': ('O2', 0., 0.),
+    'H2': ('H2', 0., 0.),
+    'Ar': ('Ar', 0., 0.),
+    'N': ('N', 455.58, 472.70),
+    'O': ('O', 231.73, 249.17),
+    'H': ('H', 203.25, 217.97),
+    'OH': ('OH', 34.22, 38.99),
+    'NO': ('NO', 86.6, 90.25),
+    'NO2': ('NO2', 51.31, 33.18),
+    'N2O': ('N2O', 104.20, 82.05),
+    'NH3': ('NH3', -16.45, -46.11),
+    'H2O': ('H2O', -228.57, -241.82),
+    'CO': ('CO', -137.17, -110.53),
+    'CO2': ('CO2', -394.36, -393.51),
+    'SO2': ('SO2', -300.19, -296.83),
+    'SO3': ('SO3', -371.06, -395.72),
+    'H2S': ('H2S', -33.56, -20.63),
+    'HCN': ('HCN', 124.7, 135.1),
+    'metano': ('CH4', -50.72, -74.81),
+    'etano': ('C2H6', -32.82, -84.68),
+    'eteno': ('C2H4', 68.15, 52.26),
+    'etino': ('C2H2', 209.20, 226.73),
+    'propano': ('C3H8', -23.49, -103.85),
+    'n-butano': ('C4H10', -17.15, -126.15),
+    'isobutano': ('C4H10', -20.76, -134.52),
+    'metanol': ('CH4O', -161.96, -200.66),
+}
+
+EquilibrioGibbs = namedtuple('EquilibrioGibbs', 'n y iteracoes convergiu')
+
+
+def elementos(formula):
+    """Dicionário elemento -> número de átomos para uma fórmula como 'C2H6'."""
+    contagem = {}
+    for simbolo, numero in re.findall(r'([A-Z][a-z]?)(\d*)', formula):
+        contagem[simbolo] = contagem.get(simbolo, 0) + (int(numero) if numero else 1)
+    if not contagem:
+        raise ValueError('fórmula inválida: %r' % formula)
+    return contagem
+
+
+def matriz_elementos(formulas):
+    """Matriz (elementos x espécies) e a lista de elementos das fórmulas."""
+    contagens = [elementos(f) for f in formulas]
+    nomes = sorted({e for c in contagens for e in c})
+    A = np.array([[c.get(e, 0) for c in contagens] for e in nomes], dtype=float)
+    return A, nomes
+
+
+class Gibbs:
+    """Minimização da energia de Gibbs para um conjunto fixo de espécies.
+
+    formulas define a matriz de elementos; G_f e H_f são as energias de Gibbs
+    e entalpias de formação a 298,15 K (kJ/mol) de cada espécie.
+    """
+
+    def __init__(self, formulas, G_f, H_f, nomes=None):
+        self.formulas = list(formulas)
+        self.nomes = list(nomes) if nomes is not None else list(self.formulas)
+        self.A, self.elementos = matriz_elementos(self.formulas)
+        self.G_f = np.asarray(G_f, dtype=float)*1000    #[J/mol]
+        self.H_f = np.asarray(H_f, dtype=float)*1000    #[J/mol]
+        self.n = len(self.formulas)
+
+    @classmethod
+    def de_especies(cls, nomes, dados=FORMACAO):
+        """Sistema com fórmulas e dados de formação tirados de dados."""
+        try:
+            formulas, G_f, H_f = zip(*(dados[nome] for nome in nomes))
+        except KeyError as erro:
+            raise KeyError('espécie sem dados de formação: %s' % erro.args[0]) from None
+        return cls(formulas, G_f, H_f, nomes)
+
+    def potenciais(self, T):
+        """Potenciais químicos padrão divididos por RT, formato T.shape + (n,)."""
+        T = np.asarray(T, dtype=float)[..., None]
+        return (self.H_f + (self.G_f - self.H_f)*T/T_REF)/(R*T)
+
+    def __call__(self, n0, T, P=P0, g=None, tol=1e-10, maxiter=200):
+        """Composição de equilíbrio a partir da alimentação n0 (mol).
+
+        T (K) e P (bar) podem ser vetores, combinados por broadcasting com os
+        demais eixos de n0 (o último eixo de n0 corresponde às espécies). g
+        substitui os potenciais padrão calculados por potenciais(T). Retorna
+        EquilibrioGibbs(n, y, iteracoes, convergiu).
+        """
+        if g is None:
+            g = self.potenciais(T)
+        n0 = np.asarray(n0, dtype=float)
+        lnP = np.log(np.asarray(P, dtype=float)/P0)[..., None]
+        forma = np.broadcast_shapes(n0.shape, np.shape(g), lnP.shape)
+        k = int(np.prod(forma[:-1]))
+        n0, g, lnP = (np.broadcast_to(v, forma).reshape(k, self.n) for v in (n0, g, lnP))
+
+        b0 = n0 @ self.A.T
+        # elementos ausentes da alimentação eliminam as espécies que os contêm
+        ausentes = np.all(b0 <= 0, axis=0)
+        ativas = ~np.any(self.A[ausentes] > 0, axis=0)
+        A = self.A[~ausentes][:, ativas]
+        # restrições independentes (ex.: isômeros tornam as linhas C e H proporcionais)
+        U, sv, _ = np.linalg.svd(A, full_matrices=False)
+        U = U[:, sv > sv[0]*1e-10]
+        # estimativa inicial: a mesma quantidade de todas as espécies ativas
+        atomos = A.sum(axis=0).mean()
+        n_ini = np.repeat(b0.sum(axis=1, keepdims=True)/(atomos*ativas.sum()), ativas.sum(), axis=1)
+        n, iteracoes, convergiu = _rand(U.T @ A, b0[:, ~ausentes] @ U, g[:, ativas],
+                                        lnP[:, ativas], n_ini, tol, maxiter)
+
+        saida = np.zeros((k, self.n))
+        saida[:, ativas] = n
+        forma_pontos = forma[:-1]
+        saida = saida.reshape(forma)
+        return EquilibrioGibbs(saida, saida/saida.sum(axis=-1, keepdims=True),
+                               iteracoes.reshape(forma_pontos), convergiu.reshape(forma_pontos))
+
+
+def _rand(A, b0, g, lnP, n, tol, maxiter, traco=1e-8, n_min=1e-250):
+    """Iterações RAND em ln n para k pontos de uma vez (A: m x n, b0: k x m)."""
+    k = len(g)
+    m = len(A)
+    n = n.copy()
+    iteracoes = np.zeros(k, dtype=int)
+    convergiu = np.zeros(k, dtype=bool)
+    ativos = np.arange(k)
+
+    for it in range(1, maxiter + 1):
+        na = n[ativos]
+        nt = na.sum(axis=1, keepdims=True)
+        mu = g[ativos] + lnP[ativos] + np.log(na/nt)
+
+        An = na[:, None, :]*A                   # (k, m, n)
+        b = An.sum(axis=2)
+        M = np.zeros((len(ativos), m + 1, m + 1))
+        M[:, :m, :m] = An @ A.T
+        M[:, :m, m] = b
+        M[:, m, :m] = b
+        rhs = np.empty((len(ativos), m + 1))
+        rhs[:, :m] = b0[ativos] - b + (An*mu[:, None, :]).sum(axis=2)
+        rhs[:, m] = (na*mu).sum(axis=1)
+        sol = np.linalg.solve(M, rhs[..., None])[..., 0]
+        pi, u = sol[:, :m], sol[:, m:]
+        dln = pi @ A + u - mu
+
+        # amortecimento: variação de no máximo e**2 nas espécies principais e
+        # espécies em traço não crescem além de ~1e-4 n_t em um passo
+        principal = na/nt > traco
+        maior = np.maximum(np.abs(u[:, 0]), np.where(principal, np.abs(dln), 0.).max(axis=1))
+        lam = np.minimum(1., 2/np.maximum(maior, 1e-300))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lam2 = np.where(~principal & (dln - u > 0),
+                            np.abs((-np.log(na/nt) - 9.2103)/(dln - u)), np.inf).min(axis=1)
+        lam = np.minimum(lam, lam2)
+
+        n[ativos] = np.maximum(na*np.exp(lam[:, None]*dln), n_min*nt)
+        iteracoes[ativos] = it
+        erro = (na*np.abs(dln)).max(axis=1)/nt[:, 0]
+        erro_b = np.abs(b - b0[ativos]).max(axis=1)/nt[:, 0]
+        pronto = (erro <= tol) & (erro_b <= tol)
+        convergiu[ativos[pronto]] = True
+        ativos = ativos[~pronto]
+        if not len(ativos):
+            break
+    return n, iteracoes, convergiu
@@ -0,0 +1,79 @@
+"""Lei de Henry com dependência da temperatura e da salinidade.
+
+As constantes estão na forma usada no livro, p_i = x_i H_i, com H em atm
+(base fração molar). A dependência com a temperatura segue a equação de
+van't Hoff
+
+    H(T) = H_ref*exp(C*(1/T_ref - 1/T))
+
+e o efeito da salinidade a equação de Setschenow, log(H_sal/H) = k_s c_sal,
+com c_sal a concentração de NaCl equivalente (mol/L).
+
+Os valores da tabela GASES foram convertidos das constantes de solubilidade
+k_H (mol L-1 atm-1) a 298.15 K compiladas por Sander (H = 55.34/k_H); as
+constantes de Setschenow são valores aproximados para NaCl.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+R = 0.082057           #[L atm/(K mol)]
+T_REF = 298.15         #[K]
+M_NACL = 58.44         #[g/mol]
+
+Dissolvido = namedtuple('Dissolvido', 'x c V')
+
+# gás: (H_ref [atm] a 298.15 K, C [K], k_s [L/mol])
+GASES = {
+    'O2': (4.257e4, 1500., 0.143),
+    'N2': (9.072e4, 1300., 0.161),
+    'Ar': (3.953e4, 1500., 0.146),
+    'CO2': (1.628e3, 2400., 0.103),
+    'CH4': (3.953e4, 1600., 0.127),
+    'H2': (7.095e4, 500., 0.102),
+    'He': (1.456e5, 92., 0.081),
+}
+
+
+def van_t_hoff(H_ref, C, T, T_ref=T_REF):
+    """Constante de Henry na temperatura T (K) pela equação de van't Hoff."""
+    return H_ref*np.exp(C*(1/T_ref - 1/np.asarray(T, dtype=float)))
+
+
+def parametros(gases):
+    """Vetores (H_ref, C, k_s) para um gás ou uma lista de gases da tabela."""
+    if isinstance(gases, str):
+        gases = [gases]
+    try:
+        return tuple(np.array(v) for v in zip(*(GASES[gas] for gas in gases)))
+    except KeyError as erro:
+        raise KeyError('gás sem constante de Henry tabelada: %s' % erro.args[0]) from None
+
+
+def constante_henry(gases, T, salinidade=0.):
+    """Constante de Henry (atm) em T (K) e salinidade (g de sal por kg de água).
+
+    Para um único gás (texto) o resultado tem o formato de T; para uma lista de
+    gases, o último eixo corresponde aos gases.
+    """
+    H_ref, C, ks = parametros(gases)
+    T = np.asarray(T, dtype=float)[..., None]
+    c_sal = np.asarray(salinidade, dtype=float)[..., None]/M_NACL
+    H = van_t_hoff(H_ref, C, T)*10**(ks*c_sal)
+    return H[..., 0] if isinstance(gases, str) else H
+
+
+def concentracao_dissolvida(gas, T, P, y, salinidade=0., rho=998.2, M=18.):
+    """Gás dissolvido em água em equilíbrio com uma fase gasosa.
+
+    T em K, P (pressão total) em atm e y a fração molar do gás na fase
+    gasosa; todos podem ser vetores. rho (g/L) e M (g/mol) referem-se à água.
+    Retorna Dissolvido(x, c, V): fração molar no líquido, concentração em
+    mol/L e volume do gás, como gás ideal a T e 1 atm, em mL por L de solução.
+    """
+    H = constante_henry(gas, T, salinidade)
+    x = np.asarray(y, dtype=float)*np.asarray(P, dtype=float)/H
+    c = x*rho/M                                 #[mol/L]
+    V = c*R*np.asarray(T, dtype=float)*1000     #[mL/L]
+    return Dissolvido(x, c, V)
@@ -0,0 +1,166 @@
+"""Leitura em blocos de arquivos PVT grandes e regressão incremental.
+
+Os ajustes dos exemplos (rho/p contra p para a massa molar, Z contra p para o
+coeficiente do virial) usam poucos pontos digitados. Para arquivos com
+milhões de medidas, le_blocos lê apenas as colunas pedidas, um bloco de
+linhas por vez:
+
+    .csv      texto com cabeçalho, convertido bloco a bloco por np.loadtxt
+    .npy      np.load com mmap_mode='r' (vetor estruturado com campos
+              nomeados ou matriz com colunas numeradas); os blocos são fatias
+              do arquivo mapeado, sem cópia
+    .parquet  pyarrow.parquet, por lotes (requer o pacote pyarrow)
+
+AjusteIncremental acumula o ajuste polinomial bloco a bloco sem guardar os
+dados. Em vez das equações normais X^T X, cujo número de condição é o
+quadrado do de X (p em Pa elevado ao quadrado já passa de 1e20), é mantido
+o fator triangular R da matriz aumentada [X y]: cada bloco é empilhado sob R e
+refatorado por QR. Os coeficientes, a soma dos quadrados dos resíduos
+(último elemento da diagonal ao quadrado) e a covariância ficam disponíveis a
+qualquer momento, com memória O(grau**2).
+"""
+
+import os
+from collections import namedtuple
+from itertools import islice
+
+import numpy as np
+
+R = 8.314462    #[m3 Pa/(K mol)]
+
+MassaMolar = namedtuple('MassaMolar', 'M ajuste')
+CoeficienteVirial = namedtuple('CoeficienteVirial', 'B ajuste')
+
+
+class AjusteIncremental:
+    """Ajuste de y = c0 + c1 x + ... + c_grau x**grau atualizado por blocos.
+
+    coef está em ordem crescente de potência (como em virial). Com
+    intercepto=False, c0 = 0.
+    """
+
+    def __init__(self, grau=1, intercepto=True):
+        self.grau = grau
+        self.intercepto = intercepto
+        self.potencias = np.arange(0 if intercepto else 1, grau + 1)
+        k = len(self.potencias)
+        self.R = np.zeros((k + 1, k + 1))
+        self.n = 0
+
+    def atualiza(self, x, y):
+        """Inclui as medidas (x, y) de um bloco."""
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float).ravel(), np.asarray(y, dtype=float).ravel())
+        validos = np.isfinite(x) & np.isfinite(y)
+        x, y = x[validos], y[validos]
+        if len(x) == 0:
+            return self
+        bloco = np.column_stack([x[:, None]**self.potencias, y])
+        self.R = np.linalg.qr(np.vstack([self.R, bloco]), mode='r')[:self.R.shape[0]]
+        self.n += len(x)
+        return self
+
+    @property
+    def coef(self):
+        """Coeficientes de todas as potências 0..grau."""
+        k = len(self.potencias)
+        completo = np.zeros(self.grau + 1)
+        completo[self.potencias] = np.linalg.solve(self.R[:k, :k], self.R[:k, k])
+        return completo
+
+    @property
+    def residuo(self):
+        """Soma dos quadrados dos resíduos."""
+        return self.R[-1, -1]**2
+
+    @property
+    def cov(self):
+        """Covariância dos coeficientes, s**2 (X^T X)**-1."""
+        k = len(self.potencias)
+        Rinv = np.linalg.inv(self.R[:k, :k])
+        completa = np.zeros((self.grau + 1, self.grau + 1))
+        completa[self.potencias[:, None], self.potencias] = self.residuo/(self.n - k)*(Rinv @ Rinv.T)
+        return completa
+
+
+def _blocos_csv(caminho, colunas, tamanho_bloco, delimitador):
+    with open(caminho) as arquivo:
+        cabecalho = [c.strip() for c in arquivo.readline().split(delimitador)]
+        try:
+            indices = [cabecalho.index(c) for c in colunas]
+        except ValueError as erro:
+            raise KeyError('coluna não encontrada em %s: %s' % (caminho, erro)) from None
+        while True:
+            linhas = list(islice(arquivo, tamanho_bloco))
+            if not linhas:
+                return
+            dados = np.loadtxt(linhas, delimiter=delimitador, usecols=indices, ndmin=2)
+            yield {c: dados[:, j] for j, c in enumerate(colunas)}
+
+
+def _blocos_npy(caminho, colunas, tamanho_bloco):
+    dados = np.load(caminho, mmap_mode='r')
+    for inicio in range(0, len(dados), tamanho_bloco):
+        fatia = dados[inicio:inicio + tamanho_bloco]
+        if dados.dtype.names:
+            yield {c: np.asarray(fatia[c], dtype=float) for c in colunas}
+        else:
+            yield {c: np.asarray(fatia[:, c], dtype=float) for c in colunas}
+
+
+def _blocos_parquet(caminho, colunas, tamanho_bloco):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError('a leitura de arquivos .parquet requer o pacote pyarrow') from None
+    arquivo = pq.ParquetFile(caminho)
+    for lote in arquivo.iter_batches(batch_size=tamanho_bloco, columns=list(colunas)):
+        yield {c: lote.column(c).to_numpy(zero_copy_only=False).astype(float) for c in colunas}
+
+
+def le_blocos(caminho, colunas, tamanho_bloco=1000000, delimitador=','):
+    """Gerador de blocos {coluna: vetor} com até tamanho_bloco linhas.
+
+    O formato é dado pela extensão (.csv, .npy ou .parquet). Para matrizes
+    .npy sem campos nomeados, colunas são os índices das colunas.
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == '.csv':
+        return _blocos_csv(caminho, colunas, tamanho_bloco, delimitador)
+    if extensao == '.npy':
+        return _blocos_npy(caminho, colunas, tamanho_bloco)
+    if extensao == '.parquet':
+        return _blocos_parquet(caminho, colunas, tamanho_bloco)
+    raise ValueError('formato não suportado: %s' % extensao)
+
+
+def ajusta_blocos(blocos, transforma, grau=1, intercepto=True):
+    """Consome os blocos e retorna o AjusteIncremental de y contra x.
+
+    transforma(bloco) deve retornar os vetores (x, y) do bloco.
+    """
+    ajuste = AjusteIncremental(grau, intercepto)
+    for bloco in blocos:
+        ajuste.atualiza(*transforma(bloco))
+    return ajuste
+
+
+def massa_molar(caminho, T, colunas=('p', 'rho'), R=R, tamanho_bloco=1000000):
+    """Massa molar pelo ajuste de rho/p contra p: M = RT (rho/p)_{p->0}.
+
+    Com p em Pa, rho em kg/m3 e R em m3 Pa/(K mol), M sai em kg/mol.
+    """
+    coluna_p, coluna_rho = colunas
+    ajuste = ajusta_blocos(le_blocos(caminho, colunas, tamanho_bloco),
+                           lambda b: (b[coluna_p], b[coluna_rho]/b[coluna_p]))
+    return MassaMolar(R*T*ajuste.coef[0], ajuste)
+
+
+def coeficiente_virial(caminho, T, colunas=('p', 'Z'), R=0.08314, tamanho_bloco=1000000):
+    """Segundo coeficiente do virial pelo ajuste de Z = Z0 + B'p: B = B' RT.
+
+    Com p em bar e R em L bar/(K mol), B sai em L/mol.
+    """
+    coluna_p, coluna_Z = colunas
+    ajuste = ajusta_blocos(le_blocos(caminho, colunas, tamanho_bloco),
+                           lambda b: (b[coluna_p], b[coluna_Z]))
+    return CoeficienteVirial(R*T*ajuste.coef[1], ajuste)
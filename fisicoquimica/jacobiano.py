@@ -0,0 +1,303 @@
+"""Jacobianos exatos para fsolve e least_squares.
+
+Sem jacobiano, fsolve e least_squares aproximam as derivadas por diferenças
+finitas: n + 1 avaliações do resíduo por jacobiano, com erro relativo da ordem
+de sqrt(eps) que piora quando as incógnitas são concentrações de 1e-10. Este
+módulo calcula o jacobiano exato a partir da própria função de resíduo,
+escrita como nos exemplos (desempacotando as incógnitas e retornando uma
+lista de equações):
+
+    metodo='dual'       números duais (modo direto): uma única avaliação com
+                        x + e, em que e carrega as n derivadas parciais
+    metodo='complexo'   passo complexo: J[:, j] = Im f(x + i h e_j)/h, com
+                        h = 1e-30 e sem cancelamento; n avaliações complexas
+
+Dual implementa __array_ufunc__, de forma que np.log, np.exp, np.sqrt etc.
+funcionam sem alterar o resíduo. fsolve e least_squares têm a mesma
+assinatura das funções do scipy e passam o jacobiano calculado.
+
+compara() mede, para os sistemas dos exemplos (SISTEMAS), o número de
+avaliações e o tempo com e sem o jacobiano exato:
+
+    python -m fisicoquimica.jacobiano
+"""
+
+import time
+from collections import namedtuple
+
+import numpy as np
+from scipy import optimize
+
+Comparacao = namedtuple('Comparacao', 'sistema metodo avaliacoes tempo erro')
+
+
+class Dual:
+    """Número dual vetorial: valor e derivadas parciais (último eixo de d)."""
+
+    __slots__ = ('valor', 'd')
+    __array_priority__ = 1000
+
+    def __init__(self, valor, d):
+        self.valor = valor
+        self.d = d
+
+    @classmethod
+    def variaveis(cls, x):
+        """Incógnitas x com derivadas semente (matriz identidade)."""
+        x = np.asarray(x, dtype=float)
+        return cls(x, np.eye(x.size).reshape(x.shape + (x.size,)))
+
+    def __len__(self):
+        return len(self.valor)
+
+    def __getitem__(self, i):
+        return Dual(self.valor[i], self.d[i])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __repr__(self):
+        return 'Dual(%r, %r)' % (self.valor, self.d)
+
+    def __array_ufunc__(self, ufunc, metodo, *entradas, **kwargs):
+        if metodo != '__call__' or kwargs or ufunc not in _REGRAS:
+            return NotImplemented
+        return _REGRAS[ufunc](*(_dual(x) for x in entradas))
+
+    # as operações aritméticas são escritas diretamente (sem passar pelas
+    # ufuncs), pois os resíduos dos exemplos operam sobre escalares
+    def __add__(self, outro):
+        if isinstance(outro, Dual):
+            return Dual(self.valor + outro.valor, self.d + outro.d)
+        return Dual(self.valor + outro, self.d)
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        if isinstance(outro, Dual):
+            return Dual(self.valor - outro.valor, self.d - outro.d)
+        return Dual(self.valor - outro, self.d)
+
+    def __rsub__(self, outro):
+        return Dual(outro - self.valor, -self.d)
+
+    def __mul__(self, outro):
+        if isinstance(outro, Dual):
+            return Dual(self.valor*outro.valor, _d(outro.valor)*self.d + _d(self.valor)*outro.d)
+        return Dual(self.valor*outro, _d(outro)*self.d)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, outro):
+        if isinstance(outro, Dual):
+            q = self.valor/outro.valor
+            return Dual(q, (self.d - _d(q)*outro.d)/_d(outro.valor))
+        return Dual(self.valor/outro, self.d/_d(outro))
+
+    def __rtruediv__(self, outro):
+        q = outro/self.valor
+        return Dual(q, _d(-q/self.valor)*self.d)
+
+    def __pow__(self, outro):
+        if isinstance(outro, Dual):
+            return _potencia(self, outro)
+        return Dual(self.valor**outro, _d(outro*self.valor**(outro - 1))*self.d)
+
+    def __rpow__(self, outro):
+        return _potencia(_dual(outro), self)
+
+    def __neg__(self):
+        return Dual(-self.valor, -self.d)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return np.absolute(self)
+
+
+def _dual(x):
+    # constantes têm derivada nula (d escalar, que se propaga por broadcast)
+    return x if isinstance(x, Dual) else Dual(np.asarray(x), 0.)
+
+
+def _d(v):
+    # valores em arrays recebem o eixo das derivadas
+    return v[..., None] if getattr(v, 'ndim', 0) else v
+
+
+def _potencia(x, y):
+    valor = x.valor**y.valor
+    d = _d(y.valor*x.valor**(y.valor - 1))*x.d
+    if np.any(y.d != 0):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d = d + _d(valor*np.log(x.valor))*y.d
+    return Dual(valor, d)
+
+
+def _unaria(f, df):
+    return lambda x: Dual(f(x.valor), _d(df(x.valor))*x.d)
+
+
+_REGRAS = {
+    np.add: Dual.__add__,
+    np.subtract: Dual.__sub__,
+    np.multiply: Dual.__mul__,
+    np.true_divide: Dual.__truediv__,
+    np.power: _potencia,
+    np.negative: Dual.__neg__,
+    np.positive: Dual.__pos__,
+    np.exp: _unaria(np.exp, np.exp),
+    np.log: _unaria(np.log, lambda v: 1/v),
+    np.log10: _unaria(np.log10, lambda v: 1/(v*np.log(10))),
+    np.sqrt: _unaria(np.sqrt, lambda v: 0.5/np.sqrt(v)),
+    np.square: _unaria(np.square, lambda v: 2*v),
+    np.reciprocal: _unaria(np.reciprocal, lambda v: -1/v**2),
+    np.absolute: _unaria(np.absolute, np.sign),
+    np.sin: _unaria(np.sin, np.cos),
+    np.cos: _unaria(np.cos, lambda v: -np.sin(v)),
+    np.tanh: _unaria(np.tanh, lambda v: 1 - np.tanh(v)**2),
+}
+
+
+def _empilha(saida, n):
+    # lista de equações (Dual ou constantes) -> vetor de resíduos e jacobiano
+    if isinstance(saida, Dual):
+        saida = list(saida) if saida.valor.ndim else [saida]
+    F = np.empty(len(saida))
+    J = np.zeros((len(saida), n))
+    for i, eq in enumerate(saida):
+        eq = _dual(eq)
+        F[i] = eq.valor
+        J[i] = eq.d
+    return F, J
+
+
+def residuo_jacobiano(fun, x, args=(), metodo='dual', h=1e-30):
+    """Resíduo e jacobiano exato de fun em x."""
+    x = np.asarray(x, dtype=float)
+    if metodo == 'dual':
+        return _empilha(fun(Dual.variaveis(x), *args), x.size)
+    if metodo == 'complexo':
+        F = np.asarray(fun(x, *args), dtype=float)
+        J = np.empty((F.size, x.size))
+        for j in range(x.size):
+            xj = x.astype(complex)
+            xj[j] += 1j*h
+            J[:, j] = np.imag(np.asarray(fun(xj, *args), dtype=complex))/h
+        return F, J
+    raise ValueError("metodo deve ser 'dual' ou 'complexo'")
+
+
+def jacobiano(fun, metodo='dual', h=1e-30):
+    """Função jac(x, *args) com o jacobiano exato de fun."""
+    return lambda x, *args: residuo_jacobiano(fun, x, args, metodo, h)[1]
+
+
+def fsolve(func, x0, args=(), metodo='dual', **opcoes):
+    """scipy.optimize.fsolve com fprime exato."""
+    return optimize.fsolve(func, x0, args=args, fprime=jacobiano(func, metodo), **opcoes)
+
+
+def least_squares(fun, x0, metodo='dual', **opcoes):
+    """scipy.optimize.least_squares com jac exato."""
+    return optimize.least_squares(fun, x0, jac=jacobiano(fun, metodo), **opcoes)
+
+
+# sistemas dos exemplos: (função, x0, opções, solver)
+
+def _elipses(v):
+    x, y = v
+    return [4*x**2 + y**2 - 1, x**2 + 9*y**2 - 1]
+
+
+def _saturacao_rk(v, R=82.06, T=298.15, a=1.80e8, b=62.7):
+    pvap, Vl, Vv = v
+    return [1/(Vv - Vl)*(R*T*np.log((Vv - b)/(Vl - b)) - a/(b*T**0.5)*np.log((Vv*(Vl + b)/(Vl*(Vv + b))))) - pvap,
+            R*T/(Vv - b) - a/(Vv*(Vv + b)*T**0.5) - pvap,
+            R*T/(Vl - b) - a/(Vl*(Vl + b)*T**0.5) - pvap]
+
+
+_KH, _KA1, _KA2, _PCO2 = 3.4e-2, 4.5e-7, 7.0e-11, 360e-6
+
+
+def _co2(v):
+    CO2, HCO3, H = v
+    return [_KH*_PCO2 - CO2, _KA1*CO2 - HCO3*H, HCO3 - H]
+
+
+def _co2_carbonato(v):
+    CO2, HCO3, H, CO3 = v
+    return [_KH*_PCO2 - CO2, _KA1*CO2 - HCO3*H, _KA2*HCO3 - CO3*H, HCO3 + CO3 - H]
+
+
+def _co2_hno3(v, Ka=20., Kh_hno3=2.1e5, pHNO3=10e-9):
+    CO2, HCO3, H, HNO3, NO3 = v
+    return [_KH*_PCO2 - CO2, _KA1*CO2 - HCO3*H, Ka*HNO3 - NO3*H, Kh_hno3*pHNO3 - HNO3, HCO3 + NO3 - H]
+
+
+def _no(v, K=3.7e-4):
+    x, = v
+    return [(2*x)**2 - K*(0.78 - x)*(0.21 - x)]
+
+
+def _amonia(v, K=0.013):
+    x, = v
+    return [(x/(2 - x))/(((0.5 - 0.5*x)/(2 - x))**0.5*((1.5 - 1.5*x)/(2 - x))**1.5) - K]
+
+
+SISTEMAS = {
+    'elipses (fsolve)': (_elipses, (3., 2.), {}, 'fsolve'),
+    'elipses (least_squares)': (_elipses, (2., 0.5), {}, 'least_squares'),
+    'saturação RK (least_squares)': (_saturacao_rk, (30., 80., 1200.),
+                                     {'bounds': ((1, 70, 200), (40, 200, 3000))}, 'least_squares'),
+    'CO2': (_co2, (1e-2, 1e-3, 1e-3), {}, 'fsolve'),
+    'CO2 + carbonato': (_co2_carbonato, (1e-2, 1e-6, 1e-6, 1e-10), {}, 'fsolve'),
+    'CO2 + HNO3': (_co2_hno3, (1e-2, 1e-6, 1e-3, 1e-20, 1e-3), {}, 'fsolve'),
+    'NO a 2000 K': (_no, (0.01,), {}, 'fsolve'),
+    'amônia': (_amonia, (0.1,), {}, 'fsolve'),
+}
+
+
+def compara(sistemas=None, metodos=(None, 'dual', 'complexo'), repeticoes=20):
+    """Avaliações, tempo e resíduo final de cada sistema e método.
+
+    metodo None é o solver do scipy com diferenças finitas. avaliacoes conta
+    as chamadas ao resíduo, incluindo as feitas para os jacobianos (uma por
+    jacobiano com duais, n com passo complexo). tempo é o tempo médio de uma
+    solução em segundos e erro a norma do resíduo na solução.
+    """
+    sistemas = SISTEMAS if sistemas is None else sistemas
+    linhas = []
+    for nome, (fun, x0, opcoes, solver) in sistemas.items():
+        for metodo in metodos:
+            contador = [0]
+
+            def contado(x, *args):
+                contador[0] += 1
+                return fun(x, *args)
+
+            def resolve():
+                if solver == 'fsolve':
+                    if metodo is None:
+                        return optimize.fsolve(contado, x0, **opcoes)
+                    return fsolve(contado, x0, metodo=metodo, **opcoes)
+                if metodo is None:
+                    return optimize.least_squares(contado, x0, **opcoes).x
+                return least_squares(contado, x0, metodo=metodo, **opcoes).x
+
+            x = resolve()
+            avaliacoes = contador[0]
+            inicio = time.perf_counter()
+            for _ in range(repeticoes):
+                resolve()
+            tempo = (time.perf_counter() - inicio)/repeticoes
+            erro = np.linalg.norm(np.asarray(fun(x), dtype=float))
+            linhas.append(Comparacao(nome, metodo or 'diferenças', avaliacoes, tempo, erro))
+    return linhas
+
+
+if __name__ == '__main__':
+    print('%-30s %-12s %11s %11s %11s' % ('sistema', 'jacobiano', 'avaliações', 'tempo (ms)', '|F|'))
+    for c in compara():
+        print('%-30s %-12s %11d %11.3f %11.2e' % (c.sistema, c.metodo, c.avaliacoes, 1e3*c.tempo, c.erro))
@@ -0,0 +1,173 @@
+"""Nitrogênio dissolvido no corpo ao longo de perfis de mergulho.
+
+Generaliza o Exemplo 6 de solucao-ideal. O corpo é representado por
+compartimentos (tecidos) com meias-vidas diferentes, como no modelo de
+Haldane; em cada compartimento a pressão parcial de N2 dissolvido, P_t, segue
+
+    dP_t/dt = k (y_N2 P - P_t),     k = ln(2)/meia_vida
+
+e a fração molar de N2 dissolvido é x = P_t/H (Lei de Henry). Um
+compartimento com meia-vida zero está sempre em equilíbrio com a pressão
+ambiente, que é o caso tratado no livro. Entre duas amostras a pressão
+ambiente varia linearmente, e a equação é integrada de forma exata (equação
+de Schreiner), de modo que o resultado não depende da densidade das amostras.
+
+Os perfis são processados em blocos (por exemplo lidos de um arquivo por
+le_perfil), mantendo apenas o estado dos compartimentos entre um bloco e
+outro, de forma que o uso de memória não depende do tamanho do registro.
+"""
+
+import itertools
+from collections import namedtuple
+
+import numpy as np
+
+from .henry import constante_henry
+
+R = 0.082057           #[L atm/(K mol)]
+M_AGUA = 18.           #[g/mol]
+METROS_POR_ATM = 10.08  #[m] coluna de água do mar equivalente a 1 atm
+
+# meias-vidas (min) dos compartimentos de Bühlmann ZH-L16 para N2
+MEIAS_VIDAS = (4., 8., 12.5, 18.5, 27., 38.3, 54.3, 77., 109., 146., 187., 239., 305., 390., 498., 635.)
+
+Bloco = namedtuple('Bloco', 't P P_t n_dissolvido n_liberado V_liberado')
+
+
+def profundidade_para_pressao(h, P_superficie=1.):
+    """Pressão absoluta (atm) na profundidade h (m) de água do mar."""
+    return P_superficie + np.asarray(h, dtype=float)/METROS_POR_ATM
+
+
+def le_perfil(caminho, tamanho_bloco=100000, colunas=(0, 1), delimitador=',',
+              cabecalho=0, profundidade=False):
+    """Lê um perfil (tempo em min, pressão em atm) de um arquivo texto em blocos.
+
+    Gera tuplas (t, P) com até tamanho_bloco linhas. Com profundidade=True a
+    segunda coluna é a profundidade em metros e é convertida para pressão.
+    """
+    with open(caminho) as arquivo:
+        for _ in range(cabecalho):
+            next(arquivo)
+        while True:
+            linhas = list(itertools.islice(arquivo, tamanho_bloco))
+            if not linhas:
+                return
+            dados = np.loadtxt(linhas, delimiter=delimitador, usecols=colunas, ndmin=2)
+            t, P = dados[:, 0], dados[:, 1]
+            if profundidade:
+                P = profundidade_para_pressao(P)
+            yield t, P
+
+
+class Mergulhador:
+    """Estado dos compartimentos de um mergulhador ao longo de um perfil.
+
+    massa (kg) e fracao_agua definem a quantidade de fluidos corporais, como no
+    exemplo do livro; fracoes é a fração desses fluidos em cada compartimento
+    (iguais, se omitida). T é a temperatura corporal (K) e y_N2 a fração molar
+    de N2 no gás respirado.
+    """
+
+    def __init__(self, meias_vidas=MEIAS_VIDAS, fracoes=None, massa=55., fracao_agua=0.75,
+                 T=310.15, y_N2=0.79, H=None):
+        self.meias_vidas = np.atleast_1d(np.asarray(meias_vidas, dtype=float))
+        with np.errstate(divide='ignore'):
+            self.k = np.log(2)/self.meias_vidas     #[1/min]
+        if fracoes is None:
+            fracoes = np.full(len(self.meias_vidas), 1/len(self.meias_vidas))
+        self.fracoes = np.asarray(fracoes, dtype=float)
+        self.n_agua = massa*1000*fracao_agua/M_AGUA  #[mol]
+        self.T = T
+        self.y_N2 = y_N2
+        self.H = constante_henry('N2', T) if H is None else H     #[atm]
+        self.reinicia()
+
+    def reinicia(self, P_t=None):
+        """Volta ao estado inicial; sem P_t, o primeiro ponto define a saturação."""
+        self.P_t = None if P_t is None else np.broadcast_to(np.asarray(P_t, dtype=float),
+                                                            self.k.shape).copy()
+        self._t = None
+        self._P = None
+        self._n = None
+        self.n_liberado = 0.
+        self.V_liberado = 0.
+
+    def dissolvido(self, P_t):
+        """Quantidade de N2 dissolvido (mol) para as pressões parciais P_t."""
+        return self.n_agua*(self.fracoes*np.asarray(P_t)/self.H).sum(axis=-1)
+
+    def processa(self, t, P):
+        """Avança o estado ao longo de um bloco de amostras (t em min, P em atm)."""
+        t = np.asarray(t, dtype=float)
+        P = np.asarray(P, dtype=float)
+        if self._t is None:
+            if self.P_t is None:
+                self.P_t = np.full(self.k.shape, self.y_N2*P[0])
+            self._t, self._P = t[0], P[0]
+            self._n = self.dissolvido(self.P_t)
+
+        # intervalos entre amostras, incluindo a última amostra do bloco anterior
+        dt = np.diff(t, prepend=self._t)
+        Q = self.y_N2*np.concatenate([[self._P], P])
+        P_t = _relaxacao(self.P_t, self.k, dt, Q[:-1], Q[1:])
+        # compartimentos em equilíbrio acompanham a pressão de cada amostra
+        P_t[:, np.isinf(self.k)] = self.y_N2*P[:, None]
+
+        n = self.dissolvido(P_t)
+        dn = -np.diff(n, prepend=self._n)
+        liberado = np.clip(dn, 0., None)
+        n_lib = self.n_liberado + np.cumsum(liberado)
+        V_lib = self.V_liberado + np.cumsum(liberado*R*self.T/P)    #[L]
+
+        self.P_t = P_t[-1].copy()
+        self._t, self._P, self._n = t[-1], P[-1], n[-1]
+        self.n_liberado, self.V_liberado = n_lib[-1], V_lib[-1]
+        return Bloco(t, P, P_t, n, n_lib, V_lib)
+
+    def processa_blocos(self, blocos):
+        """Gera um Bloco de resultados para cada bloco (t, P) de entrada."""
+        for t, P in blocos:
+            if len(t):
+                yield self.processa(t, P)
+
+
+def _relaxacao(P0, k, dt, Q0, Q1, s_max=40.):
+    """Integra dP/dt = k (Q - P) com Q variando linearmente de Q0 a Q1 em cada dt.
+
+    Em cada intervalo, com x = k dt, a solução fechada (equação de Schreiner) é
+    P_j = exp(-x) P_{j-1} + c_j, c_j = Q1 - Q0 exp(-x) - (Q1 - Q0)(1 - exp(-x))/x,
+    e portanto P_j = exp(-s_j) (P0 + sum(exp(s_i) c_i)), com s_j = sum(k dt_i).
+    A soma é feita em trechos nos quais s não passa de s_max, para evitar
+    estouro da exponencial. Retorna o formato (len(dt), len(k)).
+    """
+    m = len(dt)
+    saida = np.empty((m, len(k)))
+    equilibrio = np.isinf(k)
+    saida[:, equilibrio] = Q1[:, None]
+    kf = k[~equilibrio]
+    P = np.asarray(P0, dtype=float)[~equilibrio]
+    if not len(kf):
+        return saida
+
+    x = dt[:, None]*kf
+    dQ = (Q1 - Q0)[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # (1 - exp(-x))/x, com limite 1 em x -> 0
+        g = np.where(x > 1e-12, -np.expm1(-x)/x, 1.)
+    c = dQ*(1 - g) - Q0[:, None]*np.expm1(-x)
+    # intervalos com k dt > s_max já levam a exp(-s_max) ~ 0 na parte homogênea
+    kdt = np.minimum(x, s_max)
+    s = np.cumsum(kdt.max(axis=1))
+    # início de cada trecho: onde o compartimento mais rápido acumula s_max
+    cortes = np.searchsorted(s, np.arange(s_max, s[-1] if m else 0., s_max))
+    inicio = 0
+    for fim in list(cortes) + [m]:
+        if fim <= inicio:
+            continue
+        s_loc = np.cumsum(kdt[inicio:fim], axis=0)
+        termos = np.exp(s_loc)*c[inicio:fim]
+        saida[inicio:fim, ~equilibrio] = np.exp(-s_loc)*(P + np.cumsum(termos, axis=0))
+        P = saida[fim - 1, ~equilibrio]
+        inicio = fim
+    return saida
@@ -0,0 +1,119 @@
+"""Soluções ideais: pontos de bolha e de orvalho pela Lei de Raoult.
+
+A pressão de vapor das substâncias puras é calculada pela equação de Antoine
+na mesma forma usada nos exemplos do livro:
+
+    log(p(torr)) = A - B/(T(ºC) + C)
+
+As composições são vetores cujo último eixo corresponde às espécies, de modo
+que milhares de composições (e pressões ou temperaturas) são resolvidas em uma
+única chamada. Os coeficientes A, B e C são vetores com um valor por espécie.
+"""
+
+import numpy as np
+
+from ._raizes import newton_intervalo
+
+LN10 = np.log(10.)
+
+
+def _coeficientes(A, B, C):
+    return (np.asarray(A, dtype=float), np.asarray(B, dtype=float),
+            np.asarray(C, dtype=float))
+
+
+def pressao_vapor(T, A, B, C):
+    """Pressão de vapor (torr) de cada espécie na temperatura T (ºC).
+
+    O resultado tem o formato T.shape + (n,), com n o número de espécies.
+    """
+    A, B, C = _coeficientes(A, B, C)
+    T = np.asarray(T, dtype=float)[..., None]
+    return 10**(A - B/(T + C))
+
+
+def temperatura_saturacao(P, A, B, C):
+    """Temperatura (ºC) na qual cada espécie pura tem pressão de vapor P (torr)."""
+    A, B, C = _coeficientes(A, B, C)
+    P = np.asarray(P, dtype=float)[..., None]
+    return B/(A - np.log10(P)) - C
+
+
+def pressao_bolha(x, T, A, B, C):
+    """Pressão de bolha (torr) e composição do vapor para o líquido x a T (ºC).
+
+    Retorna a tupla (P, y).
+    """
+    x = np.asarray(x, dtype=float)
+    p = x*pressao_vapor(T, A, B, C)
+    P = p.sum(axis=-1)
+    return P, p/P[..., None]
+
+
+def pressao_orvalho(y, T, A, B, C):
+    """Pressão de orvalho (torr) e composição do líquido para o vapor y a T (ºC).
+
+    Retorna a tupla (P, x).
+    """
+    y = np.asarray(y, dtype=float)
+    r = y/pressao_vapor(T, A, B, C)
+    P = 1/r.sum(axis=-1)
+    return P, r*P[..., None]
+
+
+def _intervalo(z, P, A, B, C):
+    # a temperatura de bolha (ou orvalho) de uma mistura ideal está sempre
+    # entre as temperaturas de saturação dos componentes puros
+    T_sat = temperatura_saturacao(P, A, B, C)
+    T0 = (z*T_sat).sum(axis=-1)
+    return T_sat.min(axis=-1), T_sat.max(axis=-1), T0
+
+
+def temperatura_bolha(x, P, A, B, C, tol=1e-10, maxiter=100):
+    """Temperatura de bolha (ºC) e composição do vapor para o líquido x a P (torr).
+
+    Resolve ln(sum(x_i p_i(T))) = ln(P) para todas as composições de uma vez
+    pelo método de Newton protegido por bissecção. Retorna a tupla (T, y).
+    """
+    A, B, C = _coeficientes(A, B, C)
+    x = np.asarray(x, dtype=float)
+    P = np.asarray(P, dtype=float)
+    x, P = np.broadcast_arrays(x, P[..., None])
+    P = P[..., 0]
+    lnP = np.log(P)
+
+    def f(T):
+        p = x*pressao_vapor(T, A, B, C)
+        soma = p.sum(axis=-1)
+        dsoma = (p*LN10*B/(T[..., None] + C)**2).sum(axis=-1)
+        return np.log(soma) - lnP, dsoma/soma
+
+    T_min, T_max, T0 = _intervalo(x, P, A, B, C)
+    T = newton_intervalo(f, T_min, T_max, T0, tol=tol, maxiter=maxiter)
+    p = x*pressao_vapor(T, A, B, C)
+    return T, p/p.sum(axis=-1)[..., None]
+
+
+def temperatura_orvalho(y, P, A, B, C, tol=1e-10, maxiter=100):
+    """Temperatura de orvalho (ºC) e composição do líquido para o vapor y a P (torr).
+
+    Resolve ln(P) + ln(sum(y_i/p_i(T))) = 0 para todas as composições de uma vez
+    pelo método de Newton protegido por bissecção. Retorna a tupla (T, x).
+    """
+    A, B, C = _coeficientes(A, B, C)
+    y = np.asarray(y, dtype=float)
+    P = np.asarray(P, dtype=float)
+    y, P = np.broadcast_arrays(y, P[..., None])
+    P = P[..., 0]
+    lnP = np.log(P)
+
+    def f(T):
+        r = y/pressao_vapor(T, A, B, C)
+        soma = r.sum(axis=-1)
+        dsoma = -(r*LN10*B/(T[..., None] + C)**2).sum(axis=-1)
+        return lnP + np.log(soma), dsoma/soma
+
+    T_min, T_max, T0 = _intervalo(y, P, A, B, C)
+    T = newton_intervalo(f, T_min, T_max, T0, tol=tol, maxiter=maxiter)
+    r = y/pressao_vapor(T, A, B, C)
+    return T, r/r.sum(axis=-1)[..., None]
@@ -0,0 +1,144 @@
+"""Curva de saturação (pressão de vapor e volumes das fases) de equações cúbicas.
+
+Substitui a solução de (p_vap, V_l, V_v) por least_squares com limites
+escolhidos à mão. Para cada temperatura a pressão de saturação é a raiz de
+
+    f(ln p) = ln phi_l - ln phi_v,     df/d ln p = Z_l - Z_v
+
+em que as raízes de líquido e de vapor vêm do módulo cubica. A derivada é
+analítica e f é decrescente, de forma que o método de Newton protegido por
+bissecção (em ln p) converge sem estimativa inicial, desde que o intervalo
+contenha apenas pressões com três raízes. Esse intervalo é dado pelas
+espinodais, em que dp/dV = 0; com v = V/b e theta = a/(bRT) elas são as raízes
+maiores que 1 do polinômio de quarto grau
+
+    (v**2 + u v + w)**2 - theta (2v + u)(v - 1)**2 = 0
+
+Todas as temperaturas são resolvidas juntas. Cada uma tem seu intervalo
+espinodal, e por isso não é preciso continuação em T nem ajuste de limites
+para cada temperatura. Acima da temperatura crítica da equação não há
+espinodais e os resultados são nan.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from scipy.optimize import brentq, minimize_scalar
+
+from . import cubica
+from ._raizes import newton_intervalo, raizes_polinomio
+
+Saturacao = namedtuple('Saturacao', 'T p V_liq V_vap')
+
+
+def _theta(v, u, w):
+    # theta = a/(bRT) em que v é um ponto de inflexão horizontal
+    return (v**2 + u*v + w)**2/((2*v + u)*(v - 1)**2)
+
+
+def theta_critico(u, w):
+    """Menor theta = a/(bRT) com espinodais (27/8 para van der Waals)."""
+    res = minimize_scalar(lambda v: _theta(v, u, w), bounds=(1.01, 20.), method='bounded',
+                          options={'xatol': 1e-12})
+    return res.fun
+
+
+def temperatura_critica(eos, T_max=1e5):
+    """Temperatura crítica da equação de estado eos (módulo eos)."""
+    alvo = theta_critico(eos.u, eos.w)
+    g = lambda T: float(eos.parametros(T)[0])/(eos.b*eos.R*T) - alvo
+    return brentq(g, 1e-6, T_max, xtol=1e-12, rtol=4*np.finfo(float).eps)
+
+
+def espinodais(eos, T):
+    """Volumes (V_l, V_v) e pressões (p_l, p_v) das espinodais, com nan se T >= Tc."""
+    T = np.asarray(T, dtype=float)
+    a, _ = eos.parametros(T)
+    theta = a/(eos.b*eos.R*T)
+    u, w = eos.u, eos.w
+    c = np.stack(np.broadcast_arrays(w**2 - theta*u, 2*u*w - theta*(2 - 2*u),
+                                     u**2 + 2*w - theta*(u - 4), 2*u - 2*theta, 1.), axis=-1)
+    v = raizes_polinomio(c)
+    # refinamento de Newton das raízes de quarto grau
+    for _ in range(2):
+        f = (((c[..., 4:]*v + c[..., 3:4])*v + c[..., 2:3])*v + c[..., 1:2])*v + c[..., :1]
+        df = ((4*c[..., 4:]*v + 3*c[..., 3:4])*v + 2*c[..., 2:3])*v + c[..., 1:2]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            passo = f/df
+        v = np.where(np.isfinite(passo), v - passo, v)
+    v = np.sort(np.where(v > 1, v, np.nan), axis=-1)
+    V_l, V_v = v[..., 0]*eos.b, v[..., 1]*eos.b
+    return V_l, V_v, eos.pressao(T, V_l), eos.pressao(T, V_v)
+
+
+def _raizes_extremas(A, B, u, w):
+    # maior raiz pela fórmula de Cardano e menor pelo polinômio de segundo grau
+    # que sobra após dividir por (Z - Z_v): o produto das outras duas raízes,
+    # -c0/Z_v, tem precisão relativa total, e assim o líquido é resolvido mesmo
+    # quando Z_l é da ordem de B << 1 (pressões de vapor muito baixas)
+    c2, c1, c0 = cubica.coeficientes(A, B, u, w)
+    Z_v = np.nanmax(cubica.raizes_reais(c2, c1, c0), axis=-1)
+    b, c = c2 + Z_v, -c0/Z_v
+    disc = b**2 - 4*c
+    with np.errstate(invalid='ignore'):
+        Z_l = c/(-0.5*(b - np.sqrt(disc)))
+        f = ((Z_l + c2)*Z_l + c1)*Z_l + c0
+        Z_l = Z_l - f/((3*Z_l + 2*c2)*Z_l + c1)
+    Z_l = np.where((disc > 0) & (Z_l > B) & (Z_l < Z_v), Z_l, np.nan)
+    return Z_l, Z_v
+
+
+def curva_saturacao(eos, T=None, n=1000, T_min=None, tol=1e-12, maxiter=100):
+    """Pressão de saturação e volumes molares de líquido e vapor.
+
+    eos é uma equação do módulo eos. Sem T, usa n temperaturas entre T_min
+    (por padrão 0,25 Tc) e a temperatura crítica da equação. Retorna
+    Saturacao(T, p, V_liq, V_vap) nas unidades de R.
+    """
+    if T is None:
+        Tc = temperatura_critica(eos)
+        T = np.linspace(0.25*Tc if T_min is None else T_min, Tc*(1 - 1e-9), n)
+    T = np.asarray(T, dtype=float)
+    p = np.full(T.shape, np.nan)
+    V_liq = np.full(T.shape, np.nan)
+    V_vap = np.full(T.shape, np.nan)
+
+    V_sl, _, p_l, p_v = espinodais(eos, T)
+    sub = np.isfinite(p_v) & (p_v > 0)
+    if np.any(sub):
+        Ts, a = T[sub], eos.parametros(T[sub])[0]
+        RT = eos.R*Ts
+        u, w = eos.u, eos.w
+
+        def fases(ln_p):
+            P = np.exp(ln_p)
+            A, B = a*P/RT**2, eos.b*P/RT
+            Z_l, Z_v = _raizes_extremas(A, B, u, w)
+            # com uma só raiz real (perto das espinodais), ela é de líquido se
+            # estiver abaixo do volume da espinodal de líquido
+            unica = np.isnan(Z_l)
+            liquido = unica & (Z_v*RT/P < V_sl[sub])
+            Z_l = np.where(liquido, Z_v, Z_l)
+            Z_v = np.where(liquido, np.nan, Z_v)
+            return A, B, Z_l, Z_v
+
+        def residuo(ln_p):
+            A, B, Z_l, Z_v = fases(ln_p)
+            f = cubica.ln_phi(Z_l, A, B, u, w) - cubica.ln_phi(Z_v, A, B, u, w)
+            # sem vapor a pressão está acima da de saturação e sem líquido,
+            # abaixo; a derivada nan força um passo de bissecção
+            f = np.where(np.isnan(Z_v), -1., np.where(np.isnan(Z_l), 1., f))
+            return f, Z_l - Z_v
+
+        # intervalo entre as espinodais, ligeiramente por dentro; a espinodal de
+        # líquido tem pressão negativa em temperaturas baixas
+        ln_hi = np.log(p_v[sub])
+        ln_lo = np.log(np.where(p_l[sub] > 0, p_l[sub], p_v[sub]*1e-30))
+        folga = 1e-9*(ln_hi - ln_lo)
+        ln_p = newton_intervalo(residuo, ln_lo + folga, ln_hi - folga, tol=tol, maxiter=maxiter)
+
+        _, _, Z_l, Z_v = fases(ln_p)
+        p[sub] = np.exp(ln_p)
+        V_liq[sub] = Z_l*RT/p[sub]
+        V_vap[sub] = Z_v*RT/p[sub]
+    return Saturacao(T, p, V_liq, V_vap)
@@ -0,0 +1,109 @@
+"""Sistemas lineares de equilíbrio de fases resolvidos em lote.
+
+Generaliza o Exemplo 3 de solucao-ideal: um solvente que segue a Lei de Raoult
+em equilíbrio com m gases que seguem a Lei de Henry, sendo conhecida a
+composição do gás seco (por exemplo 21% de O2 e 79% de N2). Com n = m + 1
+espécies as incógnitas são ordenadas como no livro, [x_1..x_n, y_1..y_n], e as
+equações são
+
+    K_i x_i - P y_i = 0                     i = 1..n
+    y_1 + ... + y_n = 1
+    x_1 + ... + x_n = 1
+    r_j y_2 - r_2 y_j = 0                   j = 3..n
+
+onde K_1 é a pressão de vapor do solvente, K_i (i > 1) as constantes de Henry
+e r_j a fração do gás j no gás seco. Para k condições (temperaturas, pressões
+ou constantes diferentes) os sistemas são empilhados em um vetor (k, 2n, 2n)
+e resolvidos por uma única chamada ao LAPACK.
+"""
+
+import numpy as np
+
+
+def monta_sistemas(K, P, razoes):
+    """Monta a pilha de sistemas (A, b) com formatos (k, 2n, 2n) e (k, 2n).
+
+    K tem formato (k, n) (ou (n,)), P formato (k,) (ou escalar) e razoes é a
+    composição do gás seco, com n - 1 valores. K e P na mesma unidade.
+    """
+    K = np.atleast_2d(np.asarray(K, dtype=float))
+    razoes = np.asarray(razoes, dtype=float)
+    k, n = K.shape
+    if razoes.shape != (n - 1,):
+        raise ValueError('razoes deve ter um valor para cada gás (n - 1 valores)')
+    P = np.broadcast_to(np.asarray(P, dtype=float), (k,))
+
+    A = np.zeros((k, 2*n, 2*n))
+    b = np.zeros((k, 2*n))
+    i = np.arange(n)
+    A[:, i, i] = K
+    A[:, i, n + i] = -P[:, None]
+    A[:, n, n:] = 1.
+    A[:, n + 1, :n] = 1.
+    b[:, n] = 1.
+    b[:, n + 1] = 1.
+    for linha, j in enumerate(range(2, n), start=n + 2):
+        A[:, linha, n + 1] = razoes[j - 1]
+        A[:, linha, n + j] = -razoes[0]
+    return A, b
+
+
+def resolve_sistemas(A, b):
+    """Resolve a pilha A x = b (formatos (k, m, m) e (k, m)) de uma só vez."""
+    return np.linalg.solve(A, b[..., None])[..., 0]
+
+
+def resolve_schur(d, E, F, G, b1, b2):
+    """Resolve em lote o sistema em blocos [[diag(d), E], [F, G]] [u, v] = [b1, b2].
+
+    Como o primeiro bloco é diagonal, u é eliminado diretamente e resta apenas
+    o complemento de Schur S = G - F diag(1/d) E, de ordem menor:
+
+        S v = b2 - F (b1/d)
+        u = (b1 - E v)/d
+
+    d e b1 têm formato (k, n1), E (k, n1, n2), F (k, n2, n1), G (k, n2, n2) e
+    b2 (k, n2). Retorna a tupla (u, v).
+    """
+    Dinv_E = E/d[..., :, None]
+    S = G - F @ Dinv_E
+    rhs = b2 - (F @ (b1/d)[..., None])[..., 0]
+    v = np.linalg.solve(S, rhs[..., None])[..., 0]
+    u = b1/d - (Dinv_E @ v[..., None])[..., 0]
+    return u, v
+
+
+def resolve_equilibrio(K, P, razoes, metodo='schur'):
+    """Composições (x, y) no equilíbrio para k condições, formatos (k, n).
+
+    metodo='schur' elimina as frações molares do líquido pelo complemento de
+    Schur (sistema n x n por condição); metodo='denso' resolve o sistema
+    completo 2n x 2n montado por monta_sistemas.
+    """
+    if metodo == 'denso':
+        A, b = monta_sistemas(K, P, razoes)
+        X = resolve_sistemas(A, b)
+        n = A.shape[-1]//2
+        return X[:, :n], X[:, n:]
+    if metodo != 'schur':
+        raise ValueError("metodo deve ser 'schur' ou 'denso'")
+
+    K = np.atleast_2d(np.asarray(K, dtype=float))
+    razoes = np.asarray(razoes, dtype=float)
+    k, n = K.shape
+    if razoes.shape != (n - 1,):
+        raise ValueError('razoes deve ter um valor para cada gás (n - 1 valores)')
+    P = np.broadcast_to(np.asarray(P, dtype=float), (k,))
+
+    # eliminando x_i = P y_i/K_i (bloco diagonal) a equação sum(x) = 1 vira
+    # sum(P y_i/K_i) = 1 e resta o complemento de Schur n x n nas frações y
+    S = np.zeros((k, n, n))
+    S[:, 0, :] = 1.
+    S[:, 1, :] = P[:, None]/K
+    for linha, j in enumerate(range(2, n), start=2):
+        S[:, linha, 1] = razoes[j - 1]
+        S[:, linha, j] = -razoes[0]
+    rhs = np.zeros((k, n, 1))
+    rhs[:, :2] = 1.
+    y = np.linalg.solve(S, rhs)[..., 0]
+    return P[:, None]*y/K, y
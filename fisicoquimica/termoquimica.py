@@ -0,0 +1,146 @@
+"""Base de dados termoquímicos em colunas, gravada em arquivo mapeado em memória.
+
+Cada propriedade é uma linha de uma matriz (colunas x espécies), de forma que
+os valores de uma propriedade para todas as espécies ficam contíguos:
+
+    Hf   entalpia de formação a 298,15 K [kJ/mol]
+    Gf   energia de Gibbs de formação a 298,15 K [kJ/mol]
+    S    entropia padrão a 298,15 K [J/(mol K)]
+    a, b, c, d   Cp = a + b T + c T**2 + d/T**2 [J/(mol K)]
+
+A matriz é gravada como um arquivo .npy e os nomes das espécies e das colunas
+em um arquivo .json ao lado. abre() usa np.load com mmap_mode='r': a leitura
+não copia os dados, e vários processos que abrem o mesmo arquivo compartilham
+as mesmas páginas de memória. Os nomes são convertidos em índices por um
+dicionário e as propriedades de qualquer conjunto de espécies são obtidas por
+uma única indexação da matriz.
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from .gibbs import FORMACAO
+from .vant_hoff import CP_GAS, Reacao, T_REF
+
+R = 8.314   #[J/(mol K)]
+
+COLUNAS = ('Hf', 'Gf', 'S', 'a', 'b', 'c', 'd')
+
+# entropias padrão (J/(mol K)) dos gases de gibbs.FORMACAO a 298,15 K
+_ENTROPIA = {
+    'N2': 191.61, 'O2': 205.14, 'H2': 130.68, 'Ar': 154.84, 'NO': 210.76,
+    'NO2': 240.06, 'N2O': 219.85, 'NH3': 192.45, 'H2O': 188.83, 'CO': 197.67,
+    'CO2': 213.74, 'SO2': 248.22, 'SO3': 256.76, 'H2S': 205.79, 'HCN': 201.78,
+    'metano': 186.26, 'etano': 229.60, 'eteno': 219.56, 'etino': 200.94,
+    'propano': 270.02, 'n-butano': 310.23, 'isobutano': 294.75, 'metanol': 239.81,
+}
+
+
+class BaseTermoquimica:
+    """Propriedades de formação e Cp de um conjunto de espécies.
+
+    dados tem o formato (len(colunas), len(especies)) e pode ser um np.memmap.
+    """
+
+    def __init__(self, dados, especies, formulas=None, colunas=COLUNAS):
+        self.dados = dados
+        self.especies = list(especies)
+        self.formulas = list(formulas) if formulas is not None else list(self.especies)
+        self.colunas = tuple(colunas)
+        if self.dados.shape != (len(self.colunas), len(self.especies)):
+            raise ValueError('dados deve ter o formato (colunas, espécies)')
+        self.indice = {nome: i for i, nome in enumerate(self.especies)}
+        self._coluna = {nome: k for k, nome in enumerate(self.colunas)}
+
+    @classmethod
+    def de_dicionario(cls, tabela, colunas=COLUNAS):
+        """Base a partir de {espécie: (fórmula, valores na ordem de colunas)}."""
+        especies = list(tabela)
+        formulas = [tabela[e][0] for e in especies]
+        dados = np.array([tabela[e][1] for e in especies], dtype=float).T.copy()
+        return cls(dados.reshape(len(colunas), len(especies)), especies, formulas, colunas)
+
+    @classmethod
+    def abre(cls, caminho, mmap=True):
+        """Abre a base gravada por salva (caminho sem extensão)."""
+        with open(caminho + '.json') as arquivo:
+            meta = json.load(arquivo)
+        dados = np.load(caminho + '.npy', mmap_mode='r' if mmap else None)
+        return cls(dados, meta['especies'], meta['formulas'], meta['colunas'])
+
+    def salva(self, caminho):
+        """Grava a matriz em caminho.npy e os nomes em caminho.json."""
+        diretorio = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(diretorio, exist_ok=True)
+        meta = {'colunas': list(self.colunas), 'especies': self.especies, 'formulas': self.formulas}
+        # arquivos temporários renomeados no fim, como no cache de tabelas
+        for extensao, grava in (('.npy', lambda f: np.save(f, np.ascontiguousarray(self.dados))),
+                                ('.json', lambda f: f.write(json.dumps(meta, ensure_ascii=False).encode()))):
+            fd, tmp = tempfile.mkstemp(suffix=extensao, dir=diretorio)
+            with os.fdopen(fd, 'wb') as arquivo:
+                grava(arquivo)
+            os.replace(tmp, caminho + extensao)
+
+    def __len__(self):
+        return len(self.especies)
+
+    def __contains__(self, nome):
+        return nome in self.indice
+
+    def indices(self, especies=None):
+        """Índices das espécies (todas, se omitidas)."""
+        if especies is None:
+            return np.arange(len(self.especies))
+        if isinstance(especies, str):
+            especies = [especies]
+        try:
+            return np.fromiter((self.indice[e] for e in especies), dtype=np.intp, count=len(especies))
+        except KeyError as erro:
+            raise KeyError('espécie não encontrada: %s' % erro.args[0]) from None
+
+    def propriedades(self, especies=None, colunas=None):
+        """Matriz (colunas, espécies) com as propriedades pedidas."""
+        linhas = (np.arange(len(self.colunas)) if colunas is None
+                  else np.array([self._coluna[c] for c in colunas], dtype=np.intp))
+        return self.dados[np.ix_(linhas, self.indices(especies))]
+
+    def coluna(self, nome, especies=None):
+        """Valores de uma propriedade para as espécies."""
+        return self.dados[self._coluna[nome], self.indices(especies)]
+
+    def cp(self, T, especies=None):
+        """Cp (J/(mol K)) no formato T.shape + (espécies,)."""
+        a, b, c, d = self.propriedades(especies, ('a', 'b', 'c', 'd'))
+        T = np.asarray(T, dtype=float)[..., None]
+        return a + b*T + c*T**2 + d/T**2
+
+    def entalpia(self, T, especies=None):
+        """Entalpia Hf + integral de Cp de 298,15 K a T (kJ/mol)."""
+        Hf, a, b, c, d = self.propriedades(especies, ('Hf', 'a', 'b', 'c', 'd'))
+        T = np.asarray(T, dtype=float)[..., None]
+        T0 = T_REF
+        integral = a*(T - T0) + b/2*(T**2 - T0**2) + c/3*(T**3 - T0**3) - d*(1/T - 1/T0)
+        return Hf + integral/1000
+
+    def reacao(self, estequiometria):
+        """Reacao (vant_hoff) a partir dos coeficientes {espécie: nu}."""
+        nu = np.array(list(estequiometria.values()), dtype=float)
+        props = self.propriedades(list(estequiometria), ('Hf', 'Gf', 'a', 'b', 'c', 'd'))
+        dH, dG, *dCp = props @ nu
+        return Reacao(dH, dG=dG, dCp=dCp)
+
+
+def _tabela_padrao():
+    tabela = {}
+    for nome, S in _ENTROPIA.items():
+        formula, Gf, Hf = FORMACAO[nome]
+        tabela[nome] = (formula, (Hf, Gf, S) + tuple(R*v for v in CP_GAS[nome]))
+    # água líquida (Cp aproximadamente constante)
+    tabela['H2O(l)'] = ('H2O', (-285.83, -237.13, 69.91, 75.29, 0., 0., 0.))
+    return tabela
+
+
+PADRAO = BaseTermoquimica.de_dicionario(_tabela_padrao())
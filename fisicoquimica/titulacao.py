@@ -0,0 +1,109 @@
+"""Curvas de titulação ácido-base geradas em blocos.
+
+Um volume V0 (L) de solução com os ácidos da lista acidos (ver especiacao) e
+excesso inicial de cátions fortes forte (mol/L) recebe volumes V de um
+titulante forte de concentração C_titulante (mol/L, positiva para uma base
+como NaOH e negativa para um ácido como HCl). Para cada V a diluição é
+
+    f = V0/(V0 + V)
+
+as concentrações totais dos ácidos em sistema fechado passam a C f (os ácidos
+em sistema aberto continuam fixados pela pressão parcial do gás) e o excesso
+de cátions fortes passa a d = forte f + C_titulante V/(V0 + V). O balanço de
+carga é resolvido para todos os pontos de um bloco de uma só vez. A
+estimativa inicial de cada ponto vem de uma amostra do bloco (um ponto a cada
+passo_amostra), resolvida a partir do pH do último ponto do bloco anterior e
+interpolada ao longo do bloco; o intervalo de [H+] garante a convergência, e
+a estimativa reduz o número de iterações.
+
+A capacidade tampão é beta = dd/dpH = ln(10) ([H+] + [OH-] - dq/du), em que q
+é a carga negativa dos ácidos e u = ln[H+], calculada com as concentrações
+totais de cada ponto mantidas constantes (sem o efeito da diluição).
+
+Exemplo: 50 mL de HNO3 1e-3 mol/L com carbonato total 2e-3 mol/L titulados
+com NaOH 0,1 mol/L
+
+    acidos = [Acido((4.5e-7, 7.0e-11), C=2e-3, nome='CO2'),
+              Acido((20.,), C=1e-3, nome='HNO3')]
+    for bloco in curva_titulacao(acidos, np.linspace(0, 0.003, 10**6), V0=0.05, C_titulante=0.1):
+        ...
+"""
+
+import itertools
+from collections import namedtuple
+
+import numpy as np
+
+from ._raizes import newton_intervalo
+from .especiacao import H_MAX, H_MIN, LN10, Kw, _balanco_log, _Termo
+
+Titulacao = namedtuple('Titulacao', 'V pH H OH especies beta')
+
+
+def _blocos_volume(volumes, tamanho_bloco):
+    if isinstance(volumes, np.ndarray):
+        for inicio in range(0, len(volumes), tamanho_bloco):
+            yield np.asarray(volumes[inicio:inicio + tamanho_bloco], dtype=float)
+        return
+    volumes = iter(volumes)
+    while True:
+        V = np.fromiter(itertools.islice(volumes, tamanho_bloco), dtype=float)
+        if not len(V):
+            return
+        yield V
+
+
+def _termos_diluidos(acidos, f):
+    termos = []
+    for acido in acidos:
+        if acido.C is not None:
+            acido = acido._replace(C=np.asarray(acido.C, dtype=float)*f)
+        termos.append(_Termo(acido))
+    return termos
+
+
+def curva_titulacao(acidos, volumes, V0=1., C_titulante=0.1, forte=0., Kw=Kw,
+                    tamanho_bloco=100000, passo_amostra=64, tol=1e-12, maxiter=100):
+    """Gera a curva de titulação em blocos de até tamanho_bloco pontos.
+
+    volumes é a sequência de volumes de titulante adicionados (L): um vetor
+    (inclusive um np.memmap) ou qualquer iterável, lido aos poucos. Cada bloco
+    é uma Titulacao(V, pH, H, OH, especies, beta); especies é uma lista com
+    as concentrações de cada ácido, como em especiacao. passo_amostra é o
+    espaçamento da amostra que fornece as estimativas iniciais de cada bloco.
+    """
+    u0 = None
+    for V in _blocos_volume(volumes, tamanho_bloco):
+        f = V0/(V0 + V)
+        d = forte*f + C_titulante*V/(V0 + V)
+        termos = _termos_diluidos(acidos, f)
+
+        u_min = np.full(V.shape, np.log(H_MIN))
+        u_max = np.full(V.shape, np.log(H_MAX))
+        # estimativa de cada ponto: solução de uma amostra do bloco (partindo
+        # do último ponto do bloco anterior) interpolada ao longo do bloco
+        amostra = np.unique(np.r_[np.arange(0, len(V), passo_amostra), len(V) - 1])
+        termos_amostra = _termos_diluidos(acidos, f[amostra])
+        u_amostra = newton_intervalo(lambda u: _balanco_log(u, termos_amostra, d[amostra], Kw),
+                                     u_min[amostra], u_max[amostra], u0, tol=tol, maxiter=maxiter)
+        u = newton_intervalo(lambda u: _balanco_log(u, termos, d, Kw), u_min, u_max,
+                             np.interp(np.arange(len(V)), amostra, u_amostra), tol=tol, maxiter=maxiter)
+        u0 = u[-1]
+
+        H = np.exp(u)
+        OH = Kw/H
+        dq = sum(t.carga(u)[1] for t in termos)
+        beta = LN10*(H + OH - dq)
+        yield Titulacao(V, -u/LN10, H, OH, [t.especies(u) for t in termos], beta)
+
+
+def concatena(blocos):
+    """Junta os blocos gerados por curva_titulacao em uma única Titulacao."""
+    blocos = list(blocos)
+    if not blocos:
+        raise ValueError('nenhum bloco para concatenar')
+    especies = [np.concatenate([b.especies[i] for b in blocos])
+                for i in range(len(blocos[0].especies))]
+    return Titulacao(*(np.concatenate([getattr(b, campo) for b in blocos])
+                       for campo in ('V', 'pH', 'H', 'OH')),
+                     especies, np.concatenate([b.beta for b in blocos]))
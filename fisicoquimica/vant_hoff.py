@@ -0,0 +1,174 @@
+"""Constantes de equilíbrio K(T) pela equação de van't Hoff com Delta Cp(T).
+
+O capítulo de equilíbrio químico usa Delta H constante,
+
+    ln K(T) = ln K(T0) - Delta H/R (1/T - 1/T0)
+
+Aqui Delta Cp = a + b T + c T**2 + d/T**2 (J mol-1 K-1), de forma que
+
+    Delta H(T) = J + a T + b T**2/2 + c T**3/3 - d/T
+    ln K(T) = ln K(T0) + [-J/T + a ln T + b T/2 + c T**2/6 + d/(2 T**2)]/R  (de T0 a T)
+
+com J definido por Delta H(T0). As constantes J e a integral em T0 são
+calculadas uma vez por reação, de forma que Reacao.ln_K avalia milhões de
+temperaturas em uma chamada vetorizada, com custo O(1) por ponto.
+
+Quando ln K(T) não tem forma fechada barata, TabelaLnK monta uma interpolação
+de Hermite cúbica em uma malha uniforme de 1/T (em que ln K é quase linear):
+a consulta calcula diretamente o intervalo de cada temperatura. Reacao.tabela
+guarda em memória a tabela de cada reação e faixa de temperaturas; para o
+Delta Cp polinomial a expressão fechada é mais rápida que a tabela.
+"""
+
+import functools
+
+import numpy as np
+
+from .gibbs import FORMACAO
+
+R = 8.314           #[J/(mol K)]
+T_REF = 298.15      #[K]
+
+# Cp/R = A + B T + C T**2 + D/T**2 para gás ideal (Smith, Van Ness e Abbott)
+CP_GAS = {
+    'N2': (3.280, 0.593e-3, 0., 0.040e5),
+    'O2': (3.639, 0.506e-3, 0., -0.227e5),
+    'H2': (3.249, 0.422e-3, 0., 0.083e5),
+    'Ar': (2.5, 0., 0., 0.),
+    'NO': (3.387, 0.629e-3, 0., 0.014e5),
+    'NO2': (4.982, 1.195e-3, 0., -0.792e5),
+    'N2O': (5.328, 1.214e-3, 0., -0.928e5),
+    'NH3': (3.578, 3.020e-3, 0., -0.186e5),
+    'H2O': (3.470, 1.450e-3, 0., 0.121e5),
+    'CO': (3.376, 0.557e-3, 0., -0.031e5),
+    'CO2': (5.457, 1.045e-3, 0., -1.157e5),
+    'SO2': (5.699, 0.801e-3, 0., -1.015e5),
+    'SO3': (8.060, 1.056e-3, 0., -2.028e5),
+    'H2S': (3.931, 1.490e-3, 0., -0.232e5),
+    'HCN': (4.736, 1.359e-3, 0., -0.725e5),
+    'metano': (1.702, 9.081e-3, -2.164e-6, 0.),
+    'etano': (1.131, 19.225e-3, -5.561e-6, 0.),
+    'eteno': (1.424, 14.394e-3, -4.392e-6, 0.),
+    'etino': (6.132, 1.952e-3, 0., -1.299e5),
+    'propano': (1.213, 28.785e-3, -8.824e-6, 0.),
+    'n-butano': (1.935, 36.915e-3, -11.402e-6, 0.),
+    'isobutano': (1.677, 37.853e-3, -11.945e-6, 0.),
+    'metanol': (2.211, 12.216e-3, -3.450e-6, 0.),
+}
+
+
+class Reacao:
+    """Reação com Delta H e ln K (ou Delta G) conhecidos a T_ref.
+
+    dH e dG em kJ/mol; dCp é a tupla (a, b, c, d) de Delta Cp em J/(mol K).
+    Informe lnK ou dG.
+    """
+
+    def __init__(self, dH, lnK=None, dG=None, dCp=(0., 0., 0., 0.), T_ref=T_REF):
+        if lnK is None:
+            if dG is None:
+                raise ValueError('informe lnK ou dG')
+            lnK = -dG*1000/(R*T_ref)
+        self.dH = float(dH)*1000        #[J/mol]
+        self.lnK_ref = float(lnK)
+        self.dCp = tuple(float(v) for v in dCp) + (0.,)*(4 - len(dCp))
+        self.T_ref = float(T_ref)
+        a, b, c, d = self.dCp
+        T0 = self.T_ref
+        self.J = self.dH - (a*T0 + b*T0**2/2 + c*T0**3/3 - d/T0)
+        self._I0 = self._integral(T0)
+
+    @classmethod
+    def de_formacao(cls, estequiometria, formacao=FORMACAO, cp=CP_GAS):
+        """Reação a partir dos coeficientes {espécie: nu} (negativos para reagentes)."""
+        dG = dH = 0.
+        dCp = np.zeros(4)
+        for nome, nu in estequiometria.items():
+            try:
+                _, G_f, H_f = formacao[nome]
+                dCp += nu*R*np.asarray(cp[nome])
+            except KeyError:
+                raise KeyError('espécie sem dados: %s' % nome) from None
+            dG += nu*G_f
+            dH += nu*H_f
+        return cls(dH, dG=dG, dCp=dCp)
+
+    def chave(self):
+        """Parâmetros que identificam a reação."""
+        return (self.dH, self.lnK_ref, self.dCp, self.T_ref)
+
+    def _integral(self, T):
+        a, b, c, d = self.dCp
+        return (-self.J/T + a*np.log(T) + b*T/2 + c*T**2/6 + d/(2*T**2))/R
+
+    def entalpia(self, T):
+        """Delta H (J/mol) na temperatura T (K)."""
+        T = np.asarray(T, dtype=float)
+        a, b, c, d = self.dCp
+        return self.J + a*T + b*T**2/2 + c*T**3/3 - d/T
+
+    def ln_K(self, T):
+        """ln K pela expressão integrada (T em K, escalar ou vetor)."""
+        return self.lnK_ref + self._integral(np.asarray(T, dtype=float)) - self._I0
+
+    def K(self, T):
+        """Constante de equilíbrio em T (K)."""
+        return np.exp(self.ln_K(T))
+
+    def tabela(self, Tmin=200., Tmax=4000., n=4097):
+        """TabelaLnK desta reação entre Tmin e Tmax (K), guardada em memória."""
+        return _tabela(self.chave(), float(Tmin), float(Tmax), int(n))
+
+
+class TabelaLnK:
+    """Interpolação de Hermite cúbica de ln K em malha uniforme de x = 1/T.
+
+    ln_K(T) é uma função vetorizada qualquer (por exemplo, calculada a partir
+    de potenciais químicos padrão tabelados) e dlnK_dT(T) sua derivada; sem
+    ela as derivadas nos nós são estimadas por diferenças centrais. Fora de
+    [Tmin, Tmax] os valores são calculados pela própria função.
+    """
+
+    def __init__(self, ln_K, Tmin, Tmax, n=4097, dlnK_dT=None):
+        if not 0 < Tmin < Tmax:
+            raise ValueError('é preciso 0 < Tmin < Tmax')
+        self.funcao = ln_K
+        self.Tmin, self.Tmax = Tmin, Tmax
+        self.x0 = 1/Tmax
+        self.h = (1/Tmin - 1/Tmax)/(n - 1)
+        x = self.x0 + self.h*np.arange(n)
+        y = np.asarray(ln_K(1/x), dtype=float)
+        if dlnK_dT is None:
+            dx = 1e-4*self.h
+            dy = (np.asarray(ln_K(1/(x + dx))) - np.asarray(ln_K(1/(x - dx))))/(2*dx)*self.h
+        else:
+            # d ln K/dx = -T**2 d ln K/dT, multiplicada pelo passo da malha
+            dy = -np.asarray(dlnK_dT(1/x), dtype=float)/x**2*self.h
+        # coeficientes do polinômio em t = (x - x_i)/h de cada intervalo
+        y0, y1, d0, d1 = y[:-1], y[1:], dy[:-1], dy[1:]
+        self.coef = (y0, d0, 3*(y1 - y0) - 2*d0 - d1, 2*(y0 - y1) + d0 + d1)
+
+    def ln_K(self, T):
+        T = np.asarray(T, dtype=float)
+        s = (1/T - self.x0)*(1/self.h)
+        i = np.clip(s, 0, len(self.coef[0]) - 1).astype(np.intp)
+        t = s - i
+        c0, c1, c2, c3 = (np.take(c, i) for c in self.coef)
+        valor = c0 + t*(c1 + t*(c2 + t*c3))
+        fora = (T < self.Tmin) | (T > self.Tmax)
+        if np.any(fora):
+            valor = np.where(fora, self.funcao(np.where(fora, T, self.Tmax)), valor)
+        return valor
+
+    def K(self, T):
+        return np.exp(self.ln_K(T))
+
+    __call__ = ln_K
+
+
+@functools.lru_cache(maxsize=64)
+def _tabela(chave, Tmin, Tmax, n):
+    dH, lnK, dCp, T_ref = chave
+    reacao = Reacao(dH/1000, lnK=lnK, dCp=dCp, T_ref=T_ref)
+    return TabelaLnK(reacao.ln_K, Tmin, Tmax, n,
+                     lambda T: reacao.entalpia(T)/(R*T**2))
@@ -0,0 +1,172 @@
+"""Ajuste dos coeficientes do virial de muitas isotermas de uma só vez.
+
+O exemplo do argônio ajusta B e C de uma isoterma com np.polyfit de
+Z = p Vm/(RT) contra 1/Vm:
+
+    Z = A + B/Vm + C/Vm**2 + ...      (A = 1 para um gás real)
+
+ajusta_isotermas recebe as medidas de várias isotermas como vetores planos
+(com número de pontos diferente em cada isoterma), monta as matrizes de
+Vandermonde em uma pilha (isotermas, pontos, coeficientes) completada com
+linhas nulas, que não alteram os mínimos quadrados, e resolve todas pela
+fatoração QR em lote. A covariância de cada ajuste é s**2 (R^T R)**-1, com s**2
+a variância residual da isoterma.
+
+ajusta_B ajusta conjuntamente em todas as medidas um modelo suave
+B(T) = sum_k beta_k (T0/T)**k, mantendo A e C (e os demais coeficientes)
+livres em cada isoterma. Os parâmetros de cada isoterma são eliminados por
+projeção com as mesmas fatorações QR em lote, e resta um único problema de
+mínimos quadrados com len(beta) incógnitas.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+R = 0.08314     #[L bar/(K mol)]
+
+AjusteVirial = namedtuple('AjusteVirial', 'T coef cov n')
+AjusteB = namedtuple('AjusteB', 'beta T0 cov coef')
+
+
+def _agrupa(T, grupos):
+    # isotermas (por T ou pelos rótulos grupos), posição de cada medida na sua
+    # isoterma e número de medidas de cada isoterma
+    chaves = T if grupos is None else np.asarray(grupos)
+    _, inverso = np.unique(chaves, return_inverse=True)
+    inverso = inverso.ravel()
+    ordem = np.argsort(inverso, kind='stable')
+    n = np.bincount(inverso)
+    inicio = np.concatenate(([0], np.cumsum(n)[:-1]))
+    posicao = np.empty_like(inverso)
+    posicao[ordem] = np.arange(len(inverso)) - inicio[inverso[ordem]]
+    T_grupo = np.zeros(len(n))
+    np.add.at(T_grupo, inverso, T)
+    return inverso, posicao, n, T_grupo/n
+
+
+def _sistemas(T, p, Vm, grau, intercepto, R, grupos):
+    T, p, Vm = np.broadcast_arrays(*(np.asarray(v, dtype=float).ravel() for v in (T, p, Vm)))
+    if grau < 1:
+        raise ValueError('grau deve ser pelo menos 1')
+    inverso, posicao, n, T_grupo = _agrupa(T, grupos)
+    x = 1/Vm
+    y = p*Vm/(R*T)
+    potencias = np.arange(0 if intercepto else 1, grau + 1)
+    if not intercepto:
+        y = y - 1
+    # pilha de Vandermonde (isotermas, pontos, coeficientes), linhas nulas no fim
+    X = np.zeros((len(n), n.max(), len(potencias)))
+    Y = np.zeros((len(n), n.max()))
+    X[inverso, posicao] = x[:, None]**potencias
+    Y[inverso, posicao] = y
+    return X, Y, n, T_grupo, potencias, (inverso, posicao, x, T)
+
+
+def _qr(X, n):
+    # QR em lote; isotermas com poucos pontos ou colunas dependentes são
+    # marcadas e resolvidas com R = I para não interromper o lote
+    Q, Rr = np.linalg.qr(X)
+    diag = np.abs(np.diagonal(Rr, axis1=-2, axis2=-1))
+    validas = (n > X.shape[-1]) & np.all(diag > 1e-12*np.maximum(diag.max(axis=-1, keepdims=True), 1e-300), axis=-1)
+    Rr = np.where(validas[:, None, None], Rr, np.eye(X.shape[-1]))
+    return Q, Rr, validas
+
+
+def _completa(valores, potencias, grau, intercepto, fixo):
+    # coeficientes de todas as potências 0..grau, com A = 1 se não ajustado
+    forma = valores.shape[:-1] + (grau + 1,)
+    completo = np.full(forma, fixo)
+    completo[..., potencias] = valores
+    if not intercepto:
+        completo[..., 0] = 1.
+    return completo
+
+
+def ajusta_isotermas(T, p, Vm, grau=2, intercepto=True, R=R, grupos=None):
+    """Ajusta Z = A + B/Vm + C/Vm**2 + ... em cada isoterma.
+
+    T, p e Vm são vetores com uma entrada por medida (unidades coerentes com
+    R); as isotermas são identificadas pelo valor de T ou pelos rótulos
+    grupos. Com intercepto=False, A = 1. Retorna AjusteVirial com T (m,), coef
+    (m, grau + 1) em ordem crescente de potência de 1/Vm (coef[:, 1] é B e
+    coef[:, 2] é C), cov (m, grau + 1, grau + 1) e o número de medidas n.
+    Isotermas sem pontos suficientes recebem nan.
+    """
+    X, Y, n, T_grupo, potencias, _ = _sistemas(T, p, Vm, grau, intercepto, R, grupos)
+    Q, Rr, validas = _qr(X, n)
+    Qty = np.einsum('mik,mi->mk', Q, Y)
+    coef = np.linalg.solve(Rr, Qty[..., None])[..., 0]
+
+    residuo = Y - np.einsum('mik,mk->mi', X, coef)
+    k = len(potencias)
+    # sem graus de liberdade (n <= k) a variância residual é indefinida
+    gl = np.where(n > k, n - k, 1)
+    s2 = np.where(n > k, (residuo**2).sum(axis=-1)/gl, np.nan)
+    Rinv = np.linalg.inv(Rr)
+    cov = s2[:, None, None]*(Rinv @ np.swapaxes(Rinv, -1, -2))
+    coef = np.where(validas[:, None], coef, np.nan)
+    cov = np.where(validas[:, None, None], cov, np.nan)
+
+    cov_completa = np.zeros((len(n), grau + 1, grau + 1))
+    cov_completa[:, potencias[:, None], potencias] = cov
+    return AjusteVirial(T_grupo, _completa(coef, potencias, grau, intercepto, 0.), cov_completa, n)
+
+
+def ajusta_B(T, p, Vm, termos=3, grau=2, intercepto=True, T0=None, R=R, grupos=None):
+    """Ajuste conjunto de B(T) = sum_k beta_k (T0/T)**k, k = 0..termos-1.
+
+    Os demais coeficientes (A, se intercepto, C, ...) são ajustados em cada
+    isoterma. T0 é a temperatura de referência (padrão: média das isotermas).
+    Retorna AjusteB com beta, T0, a covariância de beta (nan sem graus de
+    liberdade) e coef (m, grau + 1), os coeficientes de cada isoterma com B
+    dado pelo modelo. Levanta ValueError se as isotermas não determinam os
+    termos de B(T) (por exemplo, menos temperaturas que termos).
+    """
+    X, Y, n, T_grupo, potencias, _ = _sistemas(T, p, Vm, grau, intercepto, R, grupos)
+    T0 = T_grupo.mean() if T0 is None else float(T0)
+    # coluna de B e colunas livres de cada isoterma
+    j = int(np.flatnonzero(potencias == 1)[0])
+    xB = X[..., j]
+    livres = np.delete(X, j, axis=-1)
+    base = (T0/T_grupo)[:, None]**np.arange(termos)
+    XB = xB[..., None]*base[:, None, :]
+
+    if livres.shape[-1]:
+        Q, Rr, validas = _qr(livres, n)
+        projeta = lambda M: M - np.einsum('mik,mjk,mj...->mi...', Q, Q, M)
+        XB_p, Y_p = projeta(XB), projeta(Y[..., None])[..., 0]
+        XB_p = np.where(validas[:, None, None], XB_p, 0.)
+        Y_p = np.where(validas[:, None], Y_p, 0.)
+    else:
+        XB_p, Y_p, validas = XB, Y, n > 0
+
+    A = XB_p.reshape(-1, termos)
+    beta, _, posto, _ = np.linalg.lstsq(A, Y_p.ravel(), rcond=None)
+    if posto < termos:
+        raise ValueError('a base de B(T) com %d termos é degenerada para estas isotermas '
+                         '(posto %d); use menos termos ou mais temperaturas' % (termos, posto))
+    # sem graus de liberdade a variância residual é indefinida
+    gl = n[validas].sum() - termos - livres.shape[-1]*validas.sum()
+    if gl > 0:
+        s2 = ((Y_p.ravel() - A @ beta)**2).sum()/gl
+        cov = s2*np.linalg.pinv(A.T @ A)
+    else:
+        cov = np.full((termos, termos), np.nan)
+
+    B = base @ beta
+    outros = Y - xB*B[:, None]
+    if livres.shape[-1]:
+        Qty = np.einsum('mik,mi->mk', Q, outros)
+        c = np.linalg.solve(Rr, Qty[..., None])[..., 0]
+        c = np.where(validas[:, None], c, np.nan)
+        valores = np.insert(c, j, B, axis=-1)
+    else:
+        valores = B[:, None]
+    return AjusteB(beta, T0, cov, _completa(valores, potencias, grau, intercepto, 0.))
+
+
+def B_modelo(ajuste, T):
+    """B(T) do modelo ajustado por ajusta_B."""
+    T = np.asarray(T, dtype=float)
+    return ((ajuste.T0/T)[..., None]**np.arange(len(ajuste.beta))) @ ajuste.beta
@@ -0,0 +1,26 @@
+import numpy as np
+
+from fisicoquimica.continuacao import varredura
+from fisicoquimica.especiacao import especiacao, gas_acido
+from fisicoquimica.jacobiano import SISTEMAS, _co2_hno3
+
+
+def test_varredura_hno3_espaco_log():
+    # varredura de pHNO3 a partir da estimativa do livro, com HNO3 = 1e-20
+    pHNO3 = np.geomspace(1e-10, 1e-6, 200)
+    x0 = SISTEMAS['CO2 + HNO3'][1]
+    r = varredura(lambda x, p: _co2_hno3(x, pHNO3=p), pHNO3, x0, espaco_log=True)
+    H = [especiacao([gas_acido('CO2', 360e-6), gas_acido('HNO3', p)]).H for p in pHNO3]
+    assert r.convergiu.all()
+    np.testing.assert_allclose(r.x[:, 2], H, rtol=1e-9)
+    # soluções independentes a partir da mesma estimativa
+    frio = sum(varredura(lambda x, p: _co2_hno3(x, pHNO3=p), [p], x0, espaco_log=True).avaliacoes[0]
+               for p in pHNO3)
+    assert r.avaliacoes.sum()*10 < frio
+
+
+def test_varredura_residuo_nao_finito():
+    r = varredura(lambda x, lam: [np.nan], [1.], [1.])
+    assert not r.convergiu[0] and r.iteracoes[0] == 0
+    r = varredura(lambda x, lam: [x[0]**2 - lam], [1., 2., 2., 3.], [1.])
+    np.testing.assert_allclose(r.x[:, 0], np.sqrt([1., 2., 2., 3.]))